@@ -0,0 +1,51 @@
+"""Run benchmark of fractal pipeline and save results as json"""
+
+
+if __name__ == "__main__":
+    import argparse
+    from olfractals import benchmark
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('output', help="path of json file to write")
+    parser.add_argument(
+        '--operations', nargs='+', default=benchmark.OPERATIONS,
+        help="basis operations to run",
+    )
+    parser.add_argument(
+        '--starts', nargs='+', default=benchmark.START_SEGMENTS,
+        help="start segments to run operations on",
+    )
+    parser.add_argument(
+        '--max-segments', nargs='+', type=float,
+        default=benchmark.MAX_SEGMENTS,
+        help="depths to run, as max number of segments of basis iteration",
+    )
+    parser.add_argument(
+        '--engines', nargs='+', default=['affine'],
+        help="fractal computation engines to compare",
+    )
+    args = parser.parse_args()
+
+    results = benchmark.run(
+        operations=args.operations,
+        starts=args.starts,
+        max_segments=args.max_segments,
+        engines=args.engines,
+    )
+    benchmark.save(results, args.output)
+
+    # Summary
+    startup = results['startup']
+    print(
+        f"import {startup['module']}: {startup['time']:.3f}s"
+        f" (heavy modules: {', '.join(startup['heavy_modules']) or 'none'})"
+    )
+    for case in results['results']:
+        times = ", ".join(
+            f"{stage}={measures['time']:.3f}s"
+            for stage, measures in case['stages'].items()
+        )
+        print(
+            f"{case['operation']}({case['start']}, n={case['iterations']},"
+            f" {case['engine']}): {times}"
+        )
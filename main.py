@@ -2,7 +2,6 @@
 
 
 if __name__ == "__main__":
-    import numpy as np
     from olfractals import Fractal, Screen, MAX_ITER
     from olfractals.collection import BasisOperation, StartSegment
     from time import time
@@ -35,32 +34,27 @@ if __name__ == "__main__":
     print(f"\t| iterations={iter_n}")
     print(f"\t| segments={fractal.evaluate_growth(iter_n)}")
 
-    # Compute fractal
-    t = time()
-    print("Prepare fractal lines...", end="")
-    lines = fractal.compute_on(segments, iter_n)
-    print(f" done in {time()-t}s")
-
 
     # ---------------------------------------------------------------------- #
     # Display
 
-    screen = Screen()
+    screen = Screen(flip_y=True)
 
     # Make points fit the screen
     t = time()
     print("Fit line...", end="")
-    params = screen.compute_fit_params(np.concatenate(lines))
+    params = screen.compute_fit_params(
+        bounds=fractal.bounds(iter_n, segments)
+    )
     print(f" done in {time()-t}s")
     for k, v in params.items():
         print(f"\t| {k}={v}")
 
-    # Display
+    # Compute and draw fractal lines progressively
     t = time()
-    print("Draw line...", end="")
+    print("Compute and draw lines...", end="")
     screen.open()
-    for line in lines:
-        screen.draw_line(line)
+    screen.stream(fractal.iter_lines(segments, iter_n)).join()
     print(f" done in {time()-t}s")
 
     screen.wait_close()
@@ -1,2 +1,15 @@
-from .display import Screen
+"""Fractals of lines built by iterating a basis operation
+
+Compute modules only need NumPy: Screen (which needs pygame) is imported on
+first access, so that batch jobs and worker processes don't import pygame.
+"""
 from .fractal import Fractal, MAX_ITER
+
+__all__ = ['Fractal', 'MAX_ITER', 'Screen']
+
+
+def __getattr__(name):
+    if name == 'Screen':
+        from .display import Screen
+        return Screen
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,202 @@
+"""Rendering of fractal animations as image sequences
+
+Two kinds of animations are available:
+- iterations : frames of iterations 0 to n of a basis operation
+- parameters : frames of n iterations of a basis operation whose parameters
+    are interpolated b/w two sets of values (e.g. dragon elbow)
+
+Frames are rendered on offscreen Rasters by a pool of processes and
+written to disk as soon as they are drawn, so memory is bounded by a frame
+per process. Each process keeps the Fractal of the last parameters it
+rendered, so that frames of successive iterations reuse its cached
+iterations (a DiskCache can be given to share them b/w processes). Frames
+already on disk are not rendered again (frames are written in a temporary
+file then renamed, so an interrupted run never leaves a partial frame).
+
+Basis operation must be picklable (e.g. a BasisOperation method, not a
+configured one), parameters are given separately.
+
+    >>> animate_params(
+    ...     BasisOperation.dragon, StartSegment.horizontal, 12, "frames",
+    ...     start={'elbow_x': 0.5}, stop={'elbow_x': 0.7}, n_frames=50,
+    ... )
+"""
+import numpy as np
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from .canvas import merge_bounds
+from .fractal import Fractal
+from .raster import Raster
+
+FRAME_NAME = "frame_{:05d}.png"
+STREAM_SEGMENTS = 1e6
+
+_FRACTAL = {}   # last fractal used by process, by key
+
+
+# --------------------------------------------------------------------------- #
+# Frames
+
+def interpolate(start, stop, n_frames):
+    """Return list of n_frames params linearly interpolated from start to
+    stop (dicts with same numeric params)"""
+    steps = np.linspace(0, 1, int(n_frames))
+    return [
+        {name: start[name] + t * (stop[name] - start[name]) for name in start}
+        for t in steps
+    ]
+
+
+def get_fractal(func, params, disk_cache=None):
+    """Return fractal of func configured with params, reusing last one of
+    process if it is the same"""
+    key = (func, tuple(sorted(params.items())),
+           getattr(disk_cache, 'path', None))
+    if _FRACTAL.get('key') != key:
+        _FRACTAL['key'] = key
+        _FRACTAL['fractal'] = Fractal(
+            partial(func, **params), as_basis=True, engine='affine',
+            disk_cache=disk_cache,
+        )
+    return _FRACTAL['fractal']
+
+
+def save_frame(raster, path):
+    """Save raster at path through a temporary file of same directory, so
+    that path is either missing or complete"""
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory or None, prefix=".tmp_", suffix=os.path.splitext(name)[1]
+    )
+    os.close(fd)
+    try:
+        raster.save(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def render_frame(job):
+    """Render a frame (png file) and return its path
+
+    Args:
+        job (dict): frame description with keys
+            func, params, disk_cache : fractal (see get_fractal)
+            segments, n : what to draw
+            size, line_params, bounds : raster and its fit
+            path : where to write frame
+    """
+    fractal = get_fractal(job['func'], job['params'], job['disk_cache'])
+    raster = Raster(size=job['size'], line_params=job['line_params'],
+                    flip_y=True)
+    raster.compute_fit_params(bounds=job['bounds'])
+    segments, n = job['segments'], job['n']
+    if fractal.evaluate_growth(n) * len(segments) <= STREAM_SEGMENTS:
+        raster.draw_lines(fractal.compute_on(segments, n))
+    else:
+        for lines in fractal.iter_lines(segments, n):
+            raster.draw_lines(lines)
+    save_frame(raster, job['path'])
+    return job['path']
+
+
+def render_frames(jobs, workers=None, overwrite=False):
+    """Render frames of jobs (see render_frame), possibly in parallel
+
+    Args:
+        jobs (list): frame jobs, in frame order
+        workers (int): number of processes to use
+            rendering is serial if None or 1
+        overwrite (bool): render frames already on disk again
+
+    Return:
+        (list): paths of frames
+    """
+    todo = [
+        job for job in jobs if overwrite or not os.path.exists(job['path'])
+    ]
+    if not workers or workers <= 1:
+        for job in todo:
+            render_frame(job)
+    else:
+        # Frames of a same fractal go to the same process (contiguous chunk)
+        chunksize = max(len(todo) // workers, 1)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(render_frame, todo, chunksize=chunksize))
+    return [job['path'] for job in jobs]
+
+
+# --------------------------------------------------------------------------- #
+# Animations
+
+def _jobs(func, segments, frames, directory, size, line_params, disk_cache):
+    """Return jobs of frames (list of (params, n)), fitted on common bounds"""
+    os.makedirs(directory, exist_ok=True)
+    bounds = np.inf, -np.inf, np.inf, -np.inf
+    for params, n in frames:
+        fractal = get_fractal(func, params, disk_cache)
+        bounds = merge_bounds(bounds, fractal.bounds(n, segments))
+    return [
+        {
+            'func': func, 'params': params, 'disk_cache': disk_cache,
+            'segments': segments, 'n': n,
+            'size': size, 'line_params': line_params, 'bounds': bounds,
+            'path': os.path.join(directory, FRAME_NAME.format(i)),
+        }
+        for i, (params, n) in enumerate(frames)
+    ]
+
+
+def animate_iterations(func, segments, n, directory, params=None,
+                       size=(700, 700), line_params=None, workers=None,
+                       disk_cache=None, overwrite=False):
+    """Render frames of iterations 0 to n of basis operation on segments
+
+    Args:
+        func (callable): basis operation
+        segments (list): list of segments (2-float-tuple)
+        n (int): last iteration
+        directory (str): where to write frames
+        params (dict): parameters of basis operation
+        size (2-int-tuple): size of frames
+        line_params (dict): line drawing parameters
+        workers (int): number of processes to use
+        disk_cache (DiskCache): cache shared by processes
+        overwrite (bool): render frames already on disk again
+
+    Return:
+        (list): paths of frames
+    """
+    params = {} if params is None else params
+    jobs = _jobs(func, segments, [(params, k) for k in range(n+1)],
+                 directory, size, line_params, disk_cache)
+    return render_frames(jobs, workers=workers, overwrite=overwrite)
+
+
+def animate_params(func, segments, n, directory, start, stop, n_frames,
+                   size=(700, 700), line_params=None, workers=None,
+                   disk_cache=None, overwrite=False):
+    """Render frames of n iterations of basis operation on segments with
+    parameters interpolated from start to stop
+
+    Args:
+        func (callable): basis operation
+        segments (list): list of segments (2-float-tuple)
+        n (int): number of iterations
+        directory (str): where to write frames
+        start (dict): parameters of first frame
+        stop (dict): parameters of last frame
+        n_frames (int): number of frames
+        (see animate_iterations for other args)
+
+    Return:
+        (list): paths of frames
+    """
+    frames = [(params, n) for params in interpolate(start, stop, n_frames)]
+    jobs = _jobs(func, segments, frames, directory, size, line_params,
+                 disk_cache)
+    return render_frames(jobs, workers=workers, overwrite=overwrite)
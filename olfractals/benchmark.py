@@ -0,0 +1,197 @@
+"""Benchmark of fractal computation and drawing pipeline
+
+Each basis operation of the collection is run on each start segment at
+several depths and every stage of the pipeline is measured separately:
+- build_cache   : computation of basis iterations (Fractal.build_cache)
+- compress      : joining of lines transformed on start segments
+- compute_on    : computation of lines on start segments (from cache)
+- fit           : computation of fit params
+- render        : drawing of lines on an offscreen Raster
+
+Wall time, peak memory (traced with tracemalloc, so python allocations are
+slightly slowed down) and segments per second are recorded for each stage.
+
+Startup is measured separately: time to import the package in a fresh
+interpreter (paid by every worker process) and heavy modules it loads.
+"""
+import json
+import numpy as np
+import platform
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime
+from time import perf_counter
+
+from .collection import BasisOperation, StartSegment
+from .fractal import Fractal, transform_lines
+from .lines import BASIS_SEGMENT, compress
+from .raster import Raster
+from .transformations import get_matrices
+
+OPERATIONS = [
+    'dragon', 'eve_dragon', 'koch_snowflake', 'spiral', 'leaf', 'double_arrow',
+]
+START_SEGMENTS = ['vertical', 'horizontal', 'triangle', 'star_3', 'star_5']
+MAX_SEGMENTS = (1e3, 1e4, 1e5)
+HEAVY_MODULES = ['pygame']      # must not be loaded by compute modules
+
+
+# --------------------------------------------------------------------------- #
+# Measures
+
+class Stage(object):
+
+    def __init__(self, results, name, segments):
+        """Context measuring time and peak memory of a pipeline stage
+
+        Args:
+            results (dict): where to store stage measures (under name key)
+            name (str): name of stage
+            segments (int): number of segments handled by stage
+        """
+        self.results = results
+        self.name = name
+        self.segments = segments
+        self.start = None
+
+    def __enter__(self):
+        tracemalloc.reset_peak()
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = perf_counter() - self.start
+        self.results[self.name] = {
+            'time': duration,
+            'peak_bytes': tracemalloc.get_traced_memory()[1],
+            'segments_per_sec': self.segments / duration if duration else None,
+        }
+
+
+def run_case(operation, start, n, engine='affine', size=(700, 700)):
+    """Measure each stage of pipeline for one case
+
+    Args:
+        operation (str): name of basis operation
+        start (str): name of start segments
+        n (int): number of iterations
+        engine (str): fractal computation engine
+        size (2-int-tuple): size of raster to render on
+
+    Return:
+        (dict): case description and measures of each stage
+    """
+    segments = getattr(StartSegment, start)
+    fractal = Fractal(getattr(BasisOperation, operation), as_basis=True,
+                      engine=engine)
+    n_segments = int(fractal.evaluate_growth(n) * len(segments))
+    stages = {}
+
+    tracemalloc.start()
+    try:
+        with Stage(stages, 'build_cache', fractal.evaluate_growth(n)):
+            fractal.build_cache(n)
+
+        lines = transform_lines(
+            fractal.compute_b(n, max_segments=None),
+            get_matrices(BASIS_SEGMENT, segments),
+        )
+        with Stage(stages, 'compress', n_segments):
+            compress(lines)
+
+        with Stage(stages, 'compute_on', n_segments):
+            lines = fractal.compute_on(segments, n)
+
+        raster = Raster(size=size)
+        with Stage(stages, 'fit', n_segments):
+            raster.compute_fit_params(lines)
+
+        with Stage(stages, 'render', n_segments):
+            raster.draw_lines(lines)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'operation': operation,
+        'start': start,
+        'iterations': n,
+        'engine': engine,
+        'segments': n_segments,
+        'lines': len(lines),
+        'stages': stages,
+    }
+
+
+def import_time(module='olfractals', repeat=3):
+    """Measure import of module in fresh interpreters
+
+    Args:
+        module (str): name of module to import
+        repeat (int): number of interpreters to run (best time is kept)
+
+    Return:
+        (dict): import time in seconds and heavy modules loaded by import
+    """
+    code = (
+        "import json, sys\n"
+        "from time import perf_counter\n"
+        "start = perf_counter()\n"
+        f"import {module}\n"
+        "duration = perf_counter() - start\n"
+        f"heavy = [name for name in {HEAVY_MODULES!r}\n"
+        "         if name in sys.modules]\n"
+        "print(json.dumps({'time': duration, 'heavy_modules': heavy}))\n"
+    )
+    runs = [
+        json.loads(subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, check=True,
+            text=True,
+        ).stdout.splitlines()[-1])
+        for _ in range(repeat)
+    ]
+    return {
+        'module': module,
+        'time': min(result['time'] for result in runs),
+        'heavy_modules': runs[0]['heavy_modules'],
+    }
+
+
+def run(operations=OPERATIONS, starts=START_SEGMENTS,
+        max_segments=MAX_SEGMENTS, engines=('affine',), size=(700, 700)):
+    """Run benchmark on all cases
+
+    Args:
+        operations (list): names of basis operations to run
+        starts (list): names of start segments to run operations on
+        max_segments (list): depths to run operations at, as max number of
+            segments of basis iteration (see Fractal.max_iter)
+        engines (list): fractal computation engines to compare
+        size (2-int-tuple): size of raster to render on
+
+    Return:
+        (dict): environment information and list of case results
+    """
+    results = []
+    for operation in operations:
+        fractal = Fractal(getattr(BasisOperation, operation), as_basis=True)
+        depths = sorted({fractal.max_iter(segs) for segs in max_segments})
+        for start in starts:
+            for n in depths:
+                for engine in engines:
+                    results.append(run_case(operation, start, n, engine, size))
+    return {
+        'date': datetime.now().isoformat(),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'startup': import_time(),
+        'results': results,
+    }
+
+
+def save(benchmark, path):
+    """Save benchmark results as json"""
+    with open(path, 'w') as file:
+        json.dump(benchmark, file, indent=2)
@@ -0,0 +1,173 @@
+"""Caches of computed fractal iterations
+
+An iteration is a tuple (to-iter LineSet, to-draw LineSet).
+Iterations 0 and 1 (basis segment and basis operation output) are always
+kept in memory.
+"""
+import hashlib
+import numpy as np
+import os
+import shutil
+import tempfile
+
+from .lines import LineSet
+
+DISK_CACHE_SIZE = 1e9
+PARTS = ('iter_points', 'iter_offsets', 'draw_points', 'draw_offsets')
+
+
+def basis_key(basis_output, *params):
+    """Return hash identifying a basis operation output (and params)"""
+    sha = hashlib.sha1()
+    for lines in basis_output:
+        sha.update(np.ascontiguousarray(lines.points).tobytes())
+        sha.update(np.ascontiguousarray(lines.offsets).tobytes())
+    for param in params:
+        sha.update(repr(param).encode())
+    return sha.hexdigest()
+
+
+def iteration_nbytes(iteration):
+    """Return memory used by iteration in bytes"""
+    return sum(lines.nbytes for lines in iteration)
+
+
+# --------------------------------------------------------------------------- #
+# Memory cache policies
+
+class CachePolicy(object):
+    """Keep all computed iterations in memory"""
+
+    max_bytes = None
+
+    def evict(self, cache):
+        """Remove iterations from cache (dict iteration: iteration)"""
+        return
+
+    @staticmethod
+    def evictable(cache):
+        """Return evictable iterations, from oldest to newest added"""
+        return [n for n in cache if n > 1]
+
+
+class KeepLast(CachePolicy):
+
+    def __init__(self, k=2):
+        """Keep in memory the last k computed iterations"""
+        self.k = k
+
+    def evict(self, cache):
+        evictable = self.evictable(cache)
+        for n in evictable[:max(len(evictable) - self.k, 0)]:
+            del cache[n]
+
+
+class MemoryBudget(CachePolicy):
+
+    def __init__(self, max_bytes):
+        """Keep iterations in memory while they use less than max_bytes,
+        oldest ones being removed first (last one is always kept)"""
+        self.max_bytes = max_bytes
+
+    def evict(self, cache):
+        evictable = self.evictable(cache)
+        nbytes = sum(iteration_nbytes(cache[n]) for n in evictable)
+        for n in evictable[:-1]:
+            if nbytes <= self.max_bytes:
+                break
+            nbytes -= iteration_nbytes(cache.pop(n))
+
+
+# --------------------------------------------------------------------------- #
+# Disk cache
+
+class DiskCache(object):
+
+    def __init__(self, path, max_bytes=DISK_CACHE_SIZE):
+        """Initiate a disk cache of fractal iterations
+
+        Each iteration is stored as .npy files in its own directory and is
+        loaded back memory-mapped, so that processes share a single copy.
+
+        Args:
+            path (str): directory where to store iterations
+            max_bytes (int): max size of cache, least recently used
+                iterations are removed when exceeded
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(path, exist_ok=True)
+
+    def entry_path(self, key, n):
+        return os.path.join(self.path, f"{key}_{n}")
+
+    def load(self, key, n):
+        """Return memory-mapped iteration n of key, None if not cached"""
+        path = self.entry_path(key, n)
+        try:
+            arrays = [
+                np.load(os.path.join(path, f"{part}.npy"), mmap_mode='r')
+                for part in PARTS
+            ]
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return LineSet(*arrays[:2]), LineSet(*arrays[2:])
+
+    def save(self, key, n, iteration):
+        """Store iteration n of key then evict oldest iterations"""
+        path = self.entry_path(key, n)
+        if os.path.isdir(path):
+            return
+        arrays = [
+            array
+            for lines in iteration
+            for array in (lines.points, lines.offsets)
+        ]
+
+        # Write in a temporary directory first so readers never see partial
+        # entries
+        tmp_path = tempfile.mkdtemp(dir=self.path, prefix=".tmp_")
+        for part, array in zip(PARTS, arrays):
+            np.save(os.path.join(tmp_path, f"{part}.npy"), array)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        self.evict()
+
+    def entries(self):
+        """Return list of (last access time, size, path) of cached entries"""
+        entries = []
+        for name in os.listdir(self.path):
+            path = os.path.join(self.path, name)
+            if name.startswith('.') or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(
+                    entry.stat().st_size for entry in os.scandir(path)
+                )
+                entries.append((os.stat(path).st_mtime, size, path))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    @property
+    def size(self):
+        """Total size of cached entries in bytes"""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Remove least recently used entries until size is below limit"""
+        entries = sorted(self.entries())
+        size = sum(size for _, size, _ in entries)
+        for _, e_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            size -= e_size
+
+    def clear(self):
+        """Remove all entries"""
+        for _, _, path in self.entries():
+            shutil.rmtree(path, ignore_errors=True)
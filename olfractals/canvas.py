@@ -0,0 +1,139 @@
+"""Drawing surface independent from any display backend
+
+A canvas has a size (in pixels), line drawing parameters and fit
+parameters to move points in the surface.
+"""
+import numpy as np
+
+from .lines import LineSet
+
+COLORS = {
+    'black': (0, 0, 0),
+    'white': (255, 255, 255),
+    'green': (0, 255, 0),
+    'red': (255, 0, 0),
+    'blue': (0, 0, 255),
+}
+
+
+def get_bounds(points):
+    """Return rectangle (x_min, x_max, y_min, y_max) containing points
+
+    Args:
+        points (matrix|LineSet|iterable): points, or iterable of chunks of
+            points (matrix or LineSet) to browse without concatenating them
+    """
+    if isinstance(points, LineSet):
+        points = points.points
+    if isinstance(points, np.ndarray) and points.ndim == 2:
+        if not len(points):
+            return np.inf, -np.inf, np.inf, -np.inf
+        (x_min, y_min), (x_max, y_max) = points.min(axis=0), points.max(axis=0)
+        return x_min, x_max, y_min, y_max
+
+    bounds = np.inf, -np.inf, np.inf, -np.inf
+    for chunk in points:
+        chunk = chunk if isinstance(chunk, LineSet) else np.atleast_2d(chunk)
+        bounds = merge_bounds(bounds, get_bounds(chunk))
+    return bounds
+
+
+def merge_bounds(bounds1, bounds2):
+    """Return smallest rectangle containing both rectangles"""
+    return (
+        min(bounds1[0], bounds2[0]), max(bounds1[1], bounds2[1]),
+        min(bounds1[2], bounds2[2]), max(bounds1[3], bounds2[3]),
+    )
+
+
+# --------------------------------------------------------------------------- #
+# Canvas class
+
+class Canvas(object):
+
+    def __init__(self, size=(700, 700), line_params=None, flip_y=False):
+        """Initiate a Canvas object
+
+        Args:
+            size (2-int-tuple): width and height in pixels
+            line_params (dict): default line drawing parameters
+            flip_y (bool): make y axis go up when fitting points (top of
+                canvas is at y=0)
+        """
+        self.size = size
+        self.flip_y = flip_y
+        self.background = COLORS['white']
+
+        # Line drawing params
+        self.line_params = {
+            'color': COLORS['black'],
+            'width': 2,
+        }
+        if line_params:
+            self.line_params.update(line_params)
+
+        # Line drawing fitting
+        self.fit_params = None
+
+    # ----------------------------------------------------------------------- #
+    # Drawing - Fitting
+
+    def compute_fit_params(self, points=None, screen_ratio=0.8, bounds=None):
+        """Compute fit params
+
+        Args:
+            points (matrix|LineSet|iterable): points to fit in screen, can be
+                an iterable of chunks of points
+            screen_ratio (matrix):
+            bounds (4-float-tuple): rectangle (x_min, x_max, y_min, y_max) to
+                fit instead of points
+        """
+        # Compute rectangle containing all points
+        if bounds is None:
+            bounds = get_bounds(points)
+        x_min, x_max, y_min, y_max = bounds
+        p_center = np.array([(x_min+x_max)/2, (y_min+y_max)/2])
+        p_xdelta = x_max - x_min
+        p_ydelta = y_max - y_min
+
+        # Compute rectangle where to display points
+        dx, dy = self.size[0], self.size[1]
+        d_center = np.array([dx/2, dy/2])
+        d_xdelta = screen_ratio * dx
+        d_ydelta = screen_ratio * dy
+
+        # Compute parameters to move points in display rect
+        params = {
+            'origin': p_center,
+            'factor': min(d_xdelta/p_xdelta, d_ydelta/p_ydelta),
+            'vector': d_center - p_center,
+        }
+        self.fit_params = dict(params)
+        return params
+
+    def lod_length(self, tolerance=1):
+        """Return length of tolerance pixels in points unit (to use as
+        Fractal.compute_lod min_length)"""
+        assert self.fit_params is not None, "Fit params must be computed"
+        return tolerance / self.fit_params['factor']
+
+    def fit_transform(self, points, out=None):
+        """Apply transform on using computed fit_params
+
+        Fit only scales and translates points (y-axis being flipped if
+        flip_y), which is done in place when out is given.
+
+        Args:
+            points (matrix): 2d-matrix (n*2) of points
+            out (matrix): 2d-matrix (n*2) where to write fitted points, can
+                be points itself
+        """
+        if self.fit_params is None:
+            return points
+        factor = self.fit_params['factor']
+        origin = self.fit_params['origin']
+        scale = np.array([factor, -factor if self.flip_y else factor])
+        offset = origin + self.fit_params['vector'] - scale * origin
+        out = np.multiply(points, scale, out=out)
+        out += offset
+        return out
@@ -0,0 +1,150 @@
+"""Chaos game: random iteration of fractal affine maps
+
+Instead of computing every segment of n iterations (q^n segments), points
+of the limit of the fractal (n -> infinity) are generated by random walks:
+at each step, each walker point is moved by one of the affine maps of basis
+to-iter segments, chosen at random, or jumps to a random point of basis
+to-draw lines. After a few steps (burn in), walkers are on the limit set,
+within the precision of the drawing.
+
+Walkers are moved by batches, so that memory is constant and time linear
+in the number of generated points.
+
+    >>> raster = Raster()
+    >>> render(fractal, StartSegment.triangle, 1e7, raster)
+    >>> raster.save("leaf.png")
+"""
+import numpy as np
+
+from .canvas import get_bounds
+from .lines import BASIS_SEGMENT
+from .transformations import get_matrices
+
+BATCH_POINTS = 1e5
+BURN_IN = 40
+
+
+# --------------------------------------------------------------------------- #
+# Random iteration
+
+def chaos_maps(fractal):
+    """Return maps of random iteration and their probabilities
+
+    Maps are chosen with a probability proportional to the length of their
+    segment (to-iter affine maps) or line (to-draw segments), which spreads
+    points evenly along lines.
+
+    Return:
+        (array): 3d-array (k*2*3) of affine matrices of to-iter segments
+        (array): 3d-array (m*2*2) of to-draw segments
+        (array): k+m probabilities of maps then of to-draw segments
+    """
+    matrices = fractal.matrices.reshape(-1, 2, 3)
+    draw_segments = fractal.basis_output[1].segments().astype(float)
+    weights = np.concatenate((
+        np.hypot(matrices[:, 0, 0], matrices[:, 1, 0]),
+        np.linalg.norm(draw_segments[:, 1] - draw_segments[:, 0], axis=1),
+    ))
+    if np.isinf(fractal.radius) or not weights.sum():
+        raise ValueError(
+            "Chaos game needs contracting maps and at least one segment"
+        )
+    return matrices, draw_segments, weights / weights.sum()
+
+
+def _apply(matrices, points):
+    """Apply to each point its own affine matrix (k*2*3)"""
+    return (
+        np.einsum('kij,kj->ki', matrices[:, :, :2], points)
+        + matrices[:, :, 2]
+    )
+
+
+def iter_points(fractal, segments, n_points, batch_size=BATCH_POINTS,
+                burn_in=BURN_IN, seed=None):
+    """Iterate on points of limit of fractal operation on segments by
+    chunks of batch_size points
+
+    Args:
+        fractal (Fractal): fractal whose basis output gives maps
+        segments (list): list of segments (2-float-tuple)
+        n_points (int): number of points to generate
+        batch_size (int): number of walkers moved at once
+        burn_in (int): number of steps before walkers points are used
+        seed (int): seed of random generator
+
+    Return:
+        (generator): 2d-matrices (batch_size*2) of points
+    """
+    rng = np.random.default_rng(seed)
+    matrices, draw_segments, probs = chaos_maps(fractal)
+    k = len(matrices)
+
+    starts = get_matrices(BASIS_SEGMENT, segments)
+    s_probs = np.hypot(starts[:, 0, 0], starts[:, 1, 0])
+    s_probs /= s_probs.sum()
+
+    n_points, batch_size = int(n_points), int(min(batch_size, n_points))
+    points = np.zeros((batch_size, 2))
+    points[:, 0] = rng.random(batch_size)        # on basis segment
+
+    def step():
+        choices = rng.choice(len(probs), size=batch_size, p=probs)
+        mapped = choices < k
+        points[mapped] = _apply(matrices[choices[mapped]], points[mapped])
+        if k < len(probs):
+            jumped = draw_segments[choices[~mapped] - k]
+            t = rng.random((len(jumped), 1))
+            points[~mapped] = jumped[:, 0] + t * (jumped[:, 1] - jumped[:, 0])
+
+    for _ in range(burn_in):
+        step()
+    remaining = n_points
+    while remaining > 0:
+        step()
+        chunk = points[:remaining]
+        choices = rng.choice(len(starts), size=len(chunk), p=s_probs)
+        yield _apply(starts[choices], chunk)
+        remaining -= len(chunk)
+
+
+def compute_points(fractal, segments, n_points, **params):
+    """Return 2d-matrix (n_points*2) of points of limit of fractal (see
+    iter_points)"""
+    return np.concatenate(list(
+        iter_points(fractal, segments, n_points, **params)
+    ))
+
+
+# --------------------------------------------------------------------------- #
+# Rendering
+
+def render(fractal, segments, n_points, raster, density=True, color=None,
+           gamma=0.5, **params):
+    """Draw n_points points of limit of fractal on raster
+
+    Raster is fitted on first batch of points if not fitted yet.
+
+    Args:
+        fractal (Fractal): fractal whose basis output gives maps
+        segments (list): list of segments (2-float-tuple)
+        n_points (int): number of points to generate
+        raster (Raster): where to draw points
+        density (bool): draw point density instead of single pixels
+        color (tuple): color of points (of densest pixels)
+        gamma (float): exponent applied on normalized density
+        params: iter_points params (batch_size, burn_in, seed)
+
+    Return:
+        (Raster): raster with points drawn
+    """
+    for points in iter_points(fractal, segments, n_points, **params):
+        if raster.fit_params is None:
+            raster.compute_fit_params(bounds=get_bounds(points))
+        if density:
+            raster.add_density(points)
+        else:
+            raster.draw_points(points, color=color)
+    if density:
+        raster.draw_density(color=color, gamma=gamma)
+    return raster
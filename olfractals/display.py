@@ -1,49 +1,37 @@
 import numpy as np
 import pygame
+from queue import Empty, Full, Queue
 from threading import Thread
+from time import time
 
-from .lines import line2seg
+from . import profiling
+from .canvas import COLORS, Canvas
+from .lines import LineSet, line2seg
 from .tools import wait_until
-from .transformations import transform
 
-COLORS = {
-    'black': (0, 0, 0),
-    'white': (255, 255, 255),
-    'green': (0, 255, 0),
-    'red': (255, 0, 0),
-    'blue': (0, 0, 255),
-}
+QUEUE_SIZE = 8
 
 
-class Screen(object):
+class Screen(Canvas):
 
     def __init__(self, size=(700, 700), name=None, line_params=None,
-                 fps=20):
+                 fps=20, flip_y=False):
         """Initiate a Screen object"""
+        super().__init__(size=size, line_params=line_params, flip_y=flip_y)
 
         # Screen parameters
         self.name = "FractalDisplay" if name is None else name
         self.screen = None
-        self.size = size
-        self.background = COLORS['white']
 
         # Refresh params
         self.initiated = False
         self.stop = False
         self.thread = None
         self.fps = fps
-        self.clock = pygame.time.Clock()
-
-        # Line drawing params
-        self.line_params = {
-            'color': COLORS['black'],
-            'width': 2,
-        }
-        if line_params:
-            self.line_params.update(line_params)
+        self.clock = None   # created by refresh thread
 
-        # Line drawing fitting
-        self.fit_params = None
+        # Lines waiting to be drawn by refresh thread
+        self.queue = Queue(maxsize=QUEUE_SIZE)
 
     def open(self):
         """Open a screen"""
@@ -66,6 +54,7 @@ class Screen(object):
     def refresh(self):
         """Keep the screen updated"""
         pygame.init()
+        self.clock = pygame.time.Clock()
         self.screen = pygame.display.set_mode(self.size)
         pygame.display.set_caption(self.name)
         self.clean()
@@ -76,6 +65,7 @@ class Screen(object):
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.stop = True
+            self.draw_queued(timeout=1/self.fps)
             self.update()
             self.clock.tick(self.fps)
         self.screen = None
@@ -86,9 +76,89 @@ class Screen(object):
         """Update display"""
         pygame.display.flip()
 
+    # ----------------------------------------------------------------------- #
+    # Progressive drawing
+
+    def stream(self, chunks, clean=False):
+        """Draw chunks of lines progressively, while they are computed
+
+        Chunks are consumed in a producer thread (where they are computed if
+        chunks is a generator, e.g. Fractal.iter_lines) and queued to be drawn
+        by the refresh thread. Streaming is cancelled when screen is closed.
+
+        Args:
+            chunks (iterable): chunks of lines (LineSet or list of lines)
+            clean (bool): clean screen before drawing each chunk
+                (to display successive iterations, e.g. Fractal.iter_levels)
+
+        Return:
+            (Thread): producer thread
+        """
+        thread = Thread(target=self._produce, args=(chunks, clean))
+        thread.daemon = True
+        thread.start()
+        return thread
+
+    def _produce(self, chunks, clean):
+        """Queue chunks of lines until they are exhausted or screen closed"""
+        for lines in chunks:
+            while not self.stop:
+                try:
+                    self.queue.put((lines, clean), timeout=0.1)
+                    break
+                except Full:
+                    continue
+            if self.stop:
+                break
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+    def draw_queued(self, timeout=None):
+        """Draw queued chunks of lines, for timeout seconds at most"""
+        start = time()
+        while timeout is None or time() - start < timeout:
+            try:
+                lines, clean = self.queue.get_nowait()
+            except Empty:
+                return
+            if clean:
+                self.clean()
+            self.draw_lines(lines)
+
     # ----------------------------------------------------------------------- #
     # Drawing
 
+    def draw_lines(self, lines, fit=True, color=None, width=None,
+                   antialias=False):
+        """Draw lines (LineSet or list of lines) on screen
+
+        Points of all lines are fitted and converted to pixels at once, then
+        each line is drawn with a single pygame call.
+
+        Args:
+            lines (LineSet|list): lines to draw
+            fit (bool): apply fit_params on lines
+            color (tuple): color of lines, default is line_params one
+            width (int): width of lines, default is line_params one
+            antialias (bool): draw antialiased lines (width is then 1)
+        """
+        assert self.screen is not None, "Can't draw line if no screen opened"
+        lines = LineSet.from_lines(lines)
+        draw_start = profiling.start()
+        points = self.fit_transform(lines.points) if fit else lines.points
+        points = np.rint(points).astype(np.int64).tolist()
+        offsets = lines.offsets.tolist()
+
+        color = self.line_params['color'] if color is None else color
+        width = self.line_params['width'] if width is None else width
+        for start, stop in zip(offsets[:-1], offsets[1:]):
+            line = points[start:stop]
+            if antialias:
+                pygame.draw.aalines(self.screen, color, False, line)
+            else:
+                pygame.draw.lines(self.screen, color, False, line, width)
+        profiling.stop('draw', draw_start, lines.n_segments, lines.nbytes)
+
     def draw_line(self, line, fit=True, **params):
         """Draw line on screen"""
         if fit: line = self.fit_transform(line)
@@ -104,48 +174,3 @@ class Screen(object):
         color = self.line_params['color'] if color is None else color
         width = self.line_params['width'] if width is None else width
         pygame.draw.line(self.screen, color, p1, p2, width)
-
-    # ----------------------------------------------------------------------- #
-    # Drawing - Fitting
-
-    def compute_fit_params(self, points, screen_ratio=0.8):
-        """Compute fit params
-
-        Args:
-            points (matrix): points to fit in screen
-            screen_ratio (matrix):
-        """
-        # TODO: Add a mirror symmetry to reverse image
-        # # Required cause top of screen is at y=0
-
-        # Compute rectangle containing all points
-        x_min, x_max, y_min, y_max = np.inf, -np.inf, np.inf, -np.inf
-        for x, y in points:
-            if x < x_min: x_min = x
-            if y < y_min: y_min = y
-            if x > x_max: x_max = x
-            if y > y_max: y_max = y
-        p_center = np.array([(x_min+x_max)/2, (y_min+y_max)/2])
-        p_xdelta = x_max - x_min
-        p_ydelta = y_max - y_min
-
-        # Compute rectangle where to display points
-        dx, dy = self.size[0], self.size[1]
-        d_center = np.array([dx/2, dy/2])
-        d_xdelta = screen_ratio * dx
-        d_ydelta = screen_ratio * dy
-
-        # Compute parameters to move points in display rect
-        params = {
-            'origin': p_center,
-            'factor': min(d_xdelta/p_xdelta, d_ydelta/p_ydelta),
-            'vector': d_center - p_center,
-        }
-        self.fit_params = dict(params)
-        return params
-
-    def fit_transform(self, points):
-        """Apply transform on using computed fit_params"""
-        if self.fit_params is None:
-            return points
-        return transform(points, **self.fit_params)
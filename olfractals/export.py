@@ -0,0 +1,210 @@
+"""Streaming export of lines to vector files
+
+Lines are written chunk by chunk (as yielded by Fractal.iter_lines), each
+chunk being formatted at once and written through a buffered file, so
+that memory is bounded by the chunk size whatever the number of segments.
+
+Two formats are available:
+- SVG : one path element per chunk (one subpath per line)
+- binary polyline file : header, little-endian float32 points then int64
+    line offsets, which can be loaded back memory-mapped as a LineSet
+
+Binary header (32 bytes, little-endian):
+    magic (4 bytes) | version (uint32) | points (uint64) | lines (uint64)
+    | reserved (8 bytes)
+"""
+import numpy as np
+import os
+import shutil
+import struct
+
+from .lines import LineSet
+
+BUFFER_SIZE = 1 << 20
+BINARY_MAGIC = b'OLFL'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sIQQ8x')
+POINT_DTYPE = np.dtype('<f4')
+OFFSET_DTYPE = np.dtype('<i8')
+
+
+# --------------------------------------------------------------------------- #
+# SVG
+
+def path_data(lines, decimals=3):
+    """Return SVG path data of lines (LineSet), each line being a subpath
+    "Mx,y x,y ..." (points after moveto are implicit linetos)"""
+    lines = LineSet.from_lines(lines)
+    if not len(lines):
+        return ""
+    point_format = f"%.{decimals}f,%.{decimals}f"
+    formats = np.full(lines.n_points, " " + point_format, dtype=object)
+    formats[lines.offsets[:-1]] = "M" + point_format
+    return "".join(formats.tolist()) % tuple(lines.points.ravel().tolist())
+
+
+class SVGWriter(object):
+
+    def __init__(self, path, bounds, width=700, color='black',
+                 line_width=1, decimals=3, flip_y=True):
+        """Initiate a SVG file written by chunks of lines
+
+        Args:
+            path (str): path of svg file
+            bounds (4-float-tuple): rectangle (x_min, x_max, y_min, y_max)
+                containing lines (see Fractal.bounds)
+            width (int): width of image in pixels (height keeps bounds
+                aspect ratio)
+            color (str): color of lines
+            line_width (float): width of lines in pixels
+            decimals (int): decimals of points coordinates
+            flip_y (bool): make y axis go up
+        """
+        self.decimals = decimals
+        self.file = open(path, 'w', buffering=BUFFER_SIZE)
+        x_min, x_max, y_min, y_max = bounds
+        dx, dy = max(x_max - x_min, 1e-9), max(y_max - y_min, 1e-9)
+        y_top = -y_max if flip_y else y_min
+        self.file.write(
+            '<svg xmlns="http://www.w3.org/2000/svg"'
+            f' width="{width}" height="{round(width * dy / dx)}"'
+            f' viewBox="{x_min} {y_top} {dx} {dy}">\n'
+            f'<g transform="scale(1,{-1 if flip_y else 1})" fill="none"'
+            f' stroke="{color}" stroke-width="{line_width}"'
+            ' stroke-linejoin="round">\n'
+        )
+
+    def write(self, lines):
+        """Write lines (LineSet or list of lines) as a path element"""
+        data = path_data(lines, decimals=self.decimals)
+        if data:
+            self.file.write(
+                f'<path vector-effect="non-scaling-stroke" d="{data}"/>\n'
+            )
+
+    def close(self):
+        """Terminate svg file"""
+        self.file.write('</g>\n</svg>\n')
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_svg(path, chunks, bounds, **params):
+    """Write chunks of lines (iterable of LineSet) in a SVG file (see
+    SVGWriter for params)"""
+    with SVGWriter(path, bounds, **params) as writer:
+        for lines in chunks:
+            writer.write(lines)
+
+
+# --------------------------------------------------------------------------- #
+# Binary polyline file
+
+class BinaryWriter(object):
+
+    def __init__(self, path):
+        """Initiate a binary polyline file written by chunks of lines
+
+        Points are written in the file as they come, offsets in a temporary
+        file appended to the points when closing.
+
+        Args:
+            path (str): path of binary file
+        """
+        self.path = path
+        self.n_points = 0
+        self.n_lines = 0
+        self.file = open(path, 'wb', buffering=BUFFER_SIZE)
+        self.file.write(
+            BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, 0, 0)
+        )
+        self.offsets_file = open(path + '.offsets', 'w+b',
+                                 buffering=BUFFER_SIZE)
+        self.offsets_file.write(np.zeros(1, dtype=OFFSET_DTYPE).tobytes())
+
+    def write(self, lines):
+        """Write lines (LineSet or list of lines) after previous ones"""
+        lines = LineSet.from_lines(lines)
+        self.file.write(lines.points.astype(POINT_DTYPE).tobytes())
+        offsets = lines.offsets[1:] + self.n_points
+        self.offsets_file.write(offsets.astype(OFFSET_DTYPE).tobytes())
+        self.n_points += lines.n_points
+        self.n_lines += len(lines)
+
+    def close(self):
+        """Append offsets and write header"""
+        self.offsets_file.seek(0)
+        shutil.copyfileobj(self.offsets_file, self.file, BUFFER_SIZE)
+        self.offsets_file.close()
+        os.remove(self.offsets_file.name)
+        self.file.seek(0)
+        self.file.write(BINARY_HEADER.pack(
+            BINARY_MAGIC, BINARY_VERSION, self.n_points, self.n_lines
+        ))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_binary(path, chunks):
+    """Write chunks of lines (iterable of LineSet) in a binary file"""
+    with BinaryWriter(path) as writer:
+        for lines in chunks:
+            writer.write(lines)
+
+
+def load_binary(path, mmap=True):
+    """Load lines of a binary file
+
+    Args:
+        path (str): path of binary file
+        mmap (bool): memory-map points and offsets instead of reading them
+
+    Return:
+        (LineSet): lines with float32 points
+    """
+    with open(path, 'rb') as file:
+        magic, version, n_points, n_lines = BINARY_HEADER.unpack(
+            file.read(BINARY_HEADER.size)
+        )
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError(f"{path} is not a binary polyline file")
+    if not n_lines:
+        return LineSet()
+
+    start = BINARY_HEADER.size
+    offsets_start = start + n_points * 2 * POINT_DTYPE.itemsize
+    if mmap:
+        points = np.memmap(path, dtype=POINT_DTYPE, mode='r', offset=start,
+                           shape=(n_points, 2))
+        offsets = np.memmap(path, dtype=OFFSET_DTYPE, mode='r',
+                            offset=offsets_start, shape=(n_lines + 1,))
+    else:
+        with open(path, 'rb') as file:
+            file.seek(start)
+            points = np.fromfile(file, dtype=POINT_DTYPE, count=2 * n_points)
+            offsets = np.fromfile(file, dtype=OFFSET_DTYPE, count=n_lines + 1)
+    return LineSet(points, offsets)
+
+
+def iter_binary(path, chunk_size=1e5):
+    """Iterate on lines of a binary file by chunks of about chunk_size
+    points (memory-mapped LineSet slices, to give to Screen.stream)"""
+    lines = load_binary(path)
+    start = 0
+    while start < len(lines):
+        stop = int(np.searchsorted(
+            lines.offsets, lines.offsets[start] + chunk_size
+        ))
+        stop = min(max(stop, start + 1), len(lines))
+        yield lines[start:stop]
+        start = stop
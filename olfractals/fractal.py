@@ -12,38 +12,116 @@ We define 2 types of operations:
 - Generic Operation : actual fractal operation
 """
 import numpy as np
+from itertools import chain
 
-from .lines import BASIS_SEGMENT, compress, lines2seg
+from . import profiling
+from .cache import CachePolicy, basis_key
+from .canvas import get_bounds, merge_bounds
+from .lines import BASIS_SEGMENT, LineSet, compress, lines2seg
 from .operations import basis2gen, gen2basis
-from .transformations import get_params, transform
+from .parallel import transform_jobs
+from .profiling import instrumented, measure_lines
+from .transformations import (
+    affine_transform, compose, get_matrices, get_params, transform
+)
 
 
 MAX_SEGMENTS= 1e7
 MAX_ITER = object()
+CHUNK_SIZE = 1e5
+OFFSET_BYTES = 8
+BOUNDS_SEGMENTS = 1e4
+BLOCK_SEGMENTS = 1e3
+ENGINES = ('loop', 'affine')
+
+
+# --------------------------------------------------------------------------- #
+# Batched line transformation
+
+def transform_lines(lines, matrices, out=None, decimals=3):
+    """Apply each affine matrix on every line
+
+    Args:
+        lines (LineSet): lines to transform
+        matrices (array): 3d-array (k*2*3) of affine matrices
+        out (matrix): 2d-matrix (k*n*2) where to write transformed points,
+            n being the number of points of lines
+        decimals (int): round transformed points
+
+    Return:
+        (LineSet): k*len(lines) lines, grouped by matrix
+    """
+    lines = LineSet.from_lines(lines)
+    if not len(lines) or not len(matrices):
+        return LineSet()
+    n_points, k = lines.n_points, len(matrices)
+    if out is not None:
+        out = out.reshape(k, n_points, 2)
+    points = affine_transform(
+        lines.points, matrices, decimals=decimals, out=out
+    )
+    offsets = lines.offsets[:-1] + n_points * np.arange(k)[:, np.newaxis]
+    return LineSet(
+        points.reshape(-1, 2),
+        np.append(offsets.ravel(), k * n_points),
+    )
 
 
 # --------------------------------------------------------------------------- #
 # Fractal class
 
 class SafetyError(Exception):
-    """Exception raised when fractal computation might take too long"""
+    """Exception raised when fractal computation might take too long (or too
+    much memory)"""
 
 
 class Fractal(object):
 
-    def __init__(self, func, as_basis=False):
+    def __init__(self, func, as_basis=False, engine='loop',
+                 disk_cache=None, cache_policy=None, dtype=np.float64,
+                 decimals=3):
         """Initiate a fractal instance
 
         Args:
             func (callable): fractal operation
             as_basis (bool): whether operation is basis
+            engine (str): computation engine
+                'loop' (default) to transform lines one by one (rounding
+                    points at each iteration)
+                'affine' to transform all lines at once with affine matrices
+                    (rounding points once, on output lines, so some points
+                    and joined lines differ from loop ones, e.g. leaf n=5)
+            disk_cache (DiskCache): where to persist computed iterations
+            cache_policy (CachePolicy): which iterations to keep in memory
+                default is to keep them all
+            dtype (type): float type of points of computed iterations
+                np.float32 halves memory used by cache
+            decimals (int): round points of output lines
+                points closer than half a unit of last decimal are joined
+                by compress (None for exact points)
         """
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Unknown engine '{engine}', expecting one of {ENGINES}"
+            )
+        self.engine = engine
+        self.dtype = np.dtype(dtype)
+        self.decimals = decimals
         self.b_func = func if as_basis else gen2basis(func)
         self._g_func = None if as_basis else func
+        self._matrices = None
+        self._radius = None
+        self.disk_cache = disk_cache
+        self.cache_policy = (
+            CachePolicy() if cache_policy is None else cache_policy
+        )
         self.cache = {
-            # iteration (int): (list of to-iter lines, list of to-draw lines)
-            0: ([BASIS_SEGMENT], []),
-            1: self.b_func(),
+            # iteration (int): (to-iter LineSet, to-draw LineSet)
+            0: (LineSet(BASIS_SEGMENT), LineSet()),
+            1: tuple(
+                LineSet.from_lines(lines).astype(self.dtype)
+                for lines in self.b_func()
+            ),
         }
 
         self.growth_info = {}
@@ -67,6 +145,32 @@ class Fractal(object):
     def basis_output(self):
         return self.cache[1]
 
+    @property
+    def tolerance(self):
+        """Max distance b/w points joined by compress"""
+        return None if self.decimals is None else 0.5 * 10**-self.decimals
+
+    @property
+    def cache_key(self):
+        """Hash identifying computed iterations"""
+        return basis_key(
+            self.basis_output, self.engine, self.dtype.str, self.decimals
+        )
+
+    @property
+    def matrices(self):
+        """Affine matrices of basis output to-iter segments"""
+        if self._matrices is None:
+            to_iter_b, _ = self.basis_output
+            self._matrices = get_matrices(BASIS_SEGMENT, to_iter_b.segments())
+        return self._matrices
+
+    @matrices.setter
+    def matrices(self, matrices):
+        """Set matrices computed elsewhere (e.g. batched with other
+        fractals ones, see sweep module)"""
+        self._matrices = matrices
+
     # ----------------------------------------------------------------------- #
     # Computation information
 
@@ -87,47 +191,202 @@ class Fractal(object):
         """
         # Compute number of segments to iter on and draw only
         to_iter, to_draw = self.basis_output
-        self.growth_info['rate'] = sum([len(points)-1 for points in to_iter])
-        self.growth_info['rest'] = sum([len(points)-1 for points in to_draw])
+        self.growth_info['rate'] = to_iter.n_segments
+        self.growth_info['rest'] = to_draw.n_segments
+
+    @property
+    def radius(self):
+        """Radius of a disc centered on basis segment middle that contains
+        lines of every iteration (inf if an operation segment is not shorter
+        than basis segment)
+
+        The disc D is such that each to-iter segment transformation maps it
+        into itself and that it contains basis output points, which is true
+        for any radius R verifying for each transformation T of factor f:
+            |T(center) - center| + f.R <= R
+        """
+        if self._radius is not None:
+            return self._radius
+
+        center = np.array([0.5, 0])
+        factors = np.sqrt(np.abs(np.linalg.det(self.matrices[:, :, :2])))
+        if np.any(factors >= 1):
+            self._radius = np.inf
+            return self._radius
+        images = affine_transform([center], self.matrices, decimals=None)
+        shifts = np.linalg.norm(images[:, 0] - center, axis=1)
+        to_iter, to_draw = self.basis_output
+        points = np.concatenate((to_iter.points, to_draw.points))
+        self._radius = max(
+            0.5,
+            np.max(shifts / (1 - factors), initial=0),
+            np.max(np.linalg.norm(points - center, axis=1), initial=0),
+        )
+        return self._radius
 
     def evaluate_growth(self, n):
         """Return number of segments after n iterations"""
         return self.q**n + self.r*(self.q**(n-1))
 
-    def max_iter(self, max_segments=MAX_SEGMENTS):
-        """Return max number of iterations to stay below max nb of segments"""
+    def evaluate_memory(self, n):
+        """Return estimated memory (bytes) needed to compute iteration n
+
+        Iterations n-1 and n are in memory at once, uncompressed in the worst
+        case
+        """
+        segments = self.evaluate_growth(n) + self.evaluate_growth(n-1)
+        return segments * self.bytes_per_segment
+
+    @property
+    def bytes_per_segment(self):
+        """Memory used by an uncompressed segment: 2 points and 1 offset"""
+        return 4 * self.dtype.itemsize + OFFSET_BYTES
+
+    def max_iter(self, max_segments=MAX_SEGMENTS, max_bytes=None):
+        """Return max number of iterations to stay below max nb of segments
+        and max memory (default is cache policy memory budget)"""
+        if max_bytes is None:
+            max_bytes = self.cache_policy.max_bytes
         n = 0
-        while self.evaluate_growth(n) <= max_segments:
+        while self.evaluate_growth(n) <= max_segments and (
+            not max_bytes or self.evaluate_memory(n) <= max_bytes
+        ):
             n += 1
         return (n-1)
 
     # ----------------------------------------------------------------------- #
     # Computation
 
-    def build_cache(self, n):
-        """Build cache up to iteration n"""
+    def build_cache(self, n, workers=None):
+        """Build cache up to iteration n
+
+        Args:
+            n (int): iteration to build
+            workers (int): number of processes to split base segments on
+                (affine engine only)
+        """
+        self.check_workers(workers)
         try:
             return self.cache[n]
         except KeyError:
             pass
+        if self.disk_cache is not None:
+            result = self.disk_cache.load(self.cache_key, n)
+            if result is not None:
+                self._store(n, result)
+                return result
 
         to_iter_b, to_draw_b = self.cache[1]            # base iteration
-        to_iter_p, to_draw_p = self.build_cache(n-1)    # previous iteration
+        to_iter_p, to_draw_p = self.build_cache(n-1, workers=workers)
+        with profiling.at_level(n):
+            start = profiling.start()
+            result = self._compute_iteration(
+                to_iter_b, to_iter_p, to_draw_p, workers
+            )
+            segments = result[0].n_segments + result[1].n_segments
+            nbytes = result[0].nbytes + result[1].nbytes
+            duration = profiling.stop('build_cache', start, segments, nbytes)
+        if duration is not None:
+            self.growth_info.setdefault('profile', {})[n] = {
+                'time': duration, 'segments': segments, 'bytes': nbytes,
+            }
+
+        self._store(n, result)
+        if self.disk_cache is not None:
+            self.disk_cache.save(self.cache_key, n, result)
+        return result
 
+    def _compute_iteration(self, to_iter_b, to_iter_p, to_draw_p, workers):
+        """Return iteration computed from base and previous iterations"""
         # Apply previous iteration to each to-iter segment of base iteration
-        to_iter, to_draw = [], list(to_draw_p)
-        for seg_b in lines2seg(to_iter_b):
-            params = get_params(BASIS_SEGMENT, seg_b, as_radian=True)
-            for line_p in to_iter_p:
-                to_iter.append(transform(line_p, **params))
-            for line_p in to_draw_p:
-                to_draw.append(transform(line_p, **params))
-
-        result = compress(to_iter), compress(to_draw)
-        self.cache[n] = result
-        return result
+        if workers:
+            source = to_iter_p + to_draw_p
+            i, j = len(to_iter_p), len(source)
+            lines = transform_jobs(source, [
+                ([matrix], 0, i) for matrix in self.matrices
+            ] + [
+                ([matrix], i, j) for matrix in self.matrices
+            ], workers=workers, decimals=None)
+            k = i * len(self.matrices)
+            to_iter, to_draw = lines[:k], to_draw_p + lines[k:]
+        elif self.engine == 'affine':
+            to_iter = transform_lines(
+                to_iter_p, self.matrices, decimals=None
+            )
+            # Write transformed to-draw lines after previous ones directly
+            n_points = to_draw_p.n_points
+            points = np.empty(
+                ((len(self.matrices) + 1) * n_points, 2), dtype=self.dtype
+            )
+            points[:n_points] = to_draw_p.points
+            lines = transform_lines(
+                to_draw_p, self.matrices, out=points[n_points:],
+                decimals=None,
+            )
+            to_draw = LineSet(points, np.concatenate(
+                (to_draw_p.offsets[:-1], lines.offsets + n_points)
+            ))
+        else:
+            to_iter, to_draw = [], list(to_draw_p)
+            for seg_b in lines2seg(to_iter_b):
+                params = get_params(BASIS_SEGMENT, seg_b, as_radian=True)
+                params['decimals'] = self.decimals
+                for line_p in to_iter_p:
+                    to_iter.append(transform(line_p, **params))
+                for line_p in to_draw_p:
+                    to_draw.append(transform(line_p, **params))
+
+        return tuple(
+            compress(lines, tolerance=self.tolerance).astype(self.dtype)
+            for lines in (to_iter, to_draw)
+        )
+
+    def round(self, lines):
+        """Return lines (LineSet) with points rounded to decimals"""
+        if self.decimals is None:
+            return lines
+        return LineSet(np.round(lines.points, self.decimals), lines.offsets)
+
+    def _store(self, n, iteration):
+        """Store iteration n in cache then apply cache policy"""
+        self.cache[n] = iteration
+        self.cache_policy.evict(self.cache)
+
+    def check_growth(self, n, max_segments=MAX_SEGMENTS, max_bytes=None):
+        """Return iteration number n, raise SafetyError if too big
+
+        Args:
+            n (int): number of iteration to compute
+                MAX_ITER to iter as many times as possible
+                    before reaching max_segments or max_bytes
+            max_segments (int): max number of segments allowed for computation
+            max_bytes (int): max memory allowed for computation
+                default is cache policy memory budget
+        """
+        if max_bytes is None:
+            max_bytes = self.cache_policy.max_bytes
+        n = self.max_iter(max_segments, max_bytes) if n is MAX_ITER  else n
+        if max_segments and self.evaluate_growth(n) > max_segments:
+            raise SafetyError(
+                f"Computing {n} iteration(s) will create more than"
+                f" {max_segments} segments"
+            )
+        if max_bytes and self.evaluate_memory(n) > max_bytes:
+            raise SafetyError(
+                f"Computing {n} iteration(s) might use more than"
+                f" {max_bytes} bytes"
+            )
+        return n
 
-    def compute_b(self, n, max_segments=MAX_SEGMENTS, concat=True):
+    def check_workers(self, workers):
+        """Raise ValueError if workers are asked to loop engine (parallel
+        jobs transform lines with affine matrices, without rounding them at
+        each iteration)"""
+        if workers and self.engine == 'loop':
+            raise ValueError("Workers are only available with affine engine")
+
+    def compute_b(self, n, max_segments=MAX_SEGMENTS, concat=True,
+                  workers=None):
         """Compute n iterations of basic fractal operation
 
         Args:
@@ -137,43 +396,307 @@ class Fractal(object):
             max_segments (int): max number of segments allowed for computation
                 1e7 is the limit where transformation computation and drawing
                 start to take too much time (10s for matrix transformation and
-                30s for drawing on decent machine)
+                30s for drawing on decent machine), see planner module for
+                estimations calibrated on current machine
             concat (bool): concatenate all lines
+            workers (int): number of processes to split base segments on
+                (affine engine only)
 
         Return:
-            (matrix) if concat
-            (2-matrix-tuple) if not concat
+            (LineSet) if concat
+            (2-LineSet-tuple) if not concat
         """
-        n = self.max_iter(max_segments) if n is MAX_ITER  else n
-        if max_segments and self.evaluate_growth(n) > max_segments:
-            raise SafetyError(
-                f"Computing {n} iteration(s) will create more than"
-                f" {max_segments} segments"
-            )
-
-        to_iter, to_draw = self.build_cache(n)
+        n = self.check_growth(n, max_segments)
+        to_iter, to_draw = self.build_cache(n, workers=workers)
         if concat:
-            if len(to_iter) and len(to_draw):
-                return to_iter + to_draw
-            else:
-                return to_iter
+            return self.round(to_iter + to_draw)
         else:
-            return to_iter, to_draw
+            return self.round(to_iter), self.round(to_draw)
 
-    def compute_on(self, segments, n):
+    @instrumented('compute_on', measure_lines)
+    def compute_on(self, segments, n, workers=None):
         """Compute n iterations of basic fractal operation
 
         Args:
             segments (list): list of segments (2-float-tuple)
             n (int): number of iteration to compute
+            workers (int): number of processes to split start segments and
+                base segments on (affine engine only)
 
         Return:
-            (list): list of lines to draw
+            (LineSet): lines to draw
         """
-        b_lines = self.compute_b(n, concat=True)
+        n = self.check_growth(n)
+        self.check_workers(workers)
+        if workers and n:
+            # Apply iteration n-1 on each (start segment, base segment)
+            to_iter_p, to_draw_p = self.build_cache(n-1, workers=workers)
+            source = to_iter_p + to_draw_p
+            i, j = len(to_iter_p), len(source)
+            jobs = []
+            for matrix in get_matrices(BASIS_SEGMENT, segments):
+                jobs += [([m, matrix], 0, i) for m in self.matrices]
+                jobs += [([matrix], i, j)]
+                jobs += [([m, matrix], i, j) for m in self.matrices]
+            return compress(
+                transform_jobs(
+                    source, jobs, workers=workers, decimals=self.decimals
+                ),
+                tolerance=self.tolerance,
+            )
+
+        to_iter, to_draw = self.build_cache(n)
+        b_lines = to_iter + to_draw
+        if self.engine == 'affine':
+            matrices = get_matrices(BASIS_SEGMENT, segments)
+            return compress(
+                transform_lines(b_lines, matrices, decimals=self.decimals),
+                tolerance=self.tolerance,
+            )
+
         lines = []
         for segment in segments:
             params = get_params(BASIS_SEGMENT, segment, as_radian=True)
+            params['decimals'] = self.decimals
             for line in b_lines:
                 lines.append(transform(line, **params))
-        return compress(lines)
+        return compress(lines, tolerance=self.tolerance)
+
+    def bounds(self, n, segments=None, max_segments=BOUNDS_SEGMENTS):
+        """Return rectangle (x_min, x_max, y_min, y_max) containing lines of n
+        iterations on segments, without computing them
+
+        Only iteration k = min(n, max_iter(max_segments)) is computed: lines
+        of iteration n are within to-draw lines of iteration k and within
+        discs of radius-ratio `radius` around its to-iter segments. Bounds
+        are exact when k == n.
+
+        Without such discs (infinite radius), SafetyError is raised if k < n
+        (max_segments must then allow computing iteration n).
+
+        Args:
+            n (int): number of iterations
+            segments (list): list of segments (2-float-tuple)
+                default is basis segment
+            max_segments (int): max number of segments to compute
+
+        Return:
+            (4-float-tuple): rectangle to use as fit bounds
+        """
+        segments = [BASIS_SEGMENT] if segments is None else segments
+        k = min(n, max(self.max_iter(max_segments), 0))
+        if k < n and np.isinf(self.radius):
+            raise SafetyError(
+                f"Bounds of {n} iteration(s) of a non contracting operation"
+                f" need all their segments, more than {max_segments}"
+            )
+
+        to_iter, to_draw = self.build_cache(k)
+        matrices = get_matrices(BASIS_SEGMENT, segments)
+        to_iter = transform_lines(to_iter, matrices, decimals=self.decimals)
+        bounds = get_bounds(
+            transform_lines(to_draw, matrices, decimals=self.decimals)
+        )
+        if k == n:
+            return merge_bounds(bounds, get_bounds(to_iter))
+
+        p1, p2 = np.moveaxis(to_iter.segments(), 1, 0)
+        centers = (p1 + p2) / 2
+        radii = self.radius * np.linalg.norm(p2 - p1, axis=1)[:, np.newaxis]
+        (x_min, y_min) = np.min(centers - radii, axis=0)
+        (x_max, y_max) = np.max(centers + radii, axis=0)
+        return merge_bounds(bounds, (x_min, x_max, y_min, y_max))
+
+    # ----------------------------------------------------------------------- #
+    # Streaming computation
+
+    def iter_lines(self, segments, n, chunk_size=CHUNK_SIZE, region=None,
+                   min_length=None, block_size=None):
+        """Iterate on lines of n iterations of fractal operation by chunks
+
+        Iteration tree is walked depth-first down to the deepest cached
+        iteration below block_size segments, so memory stays bounded whatever
+        the number of iterations (no max_segments limit).
+
+        Args:
+            segments (list): list of segments (2-float-tuple)
+            n (int): number of iteration to compute
+            chunk_size (int): min number of segments in a chunk (except last)
+            region (4-float-tuple): rectangle (x_min, x_max, y_min, y_max)
+                subtrees out of it are not expanded (see in_region)
+            min_length (float): segments shorter than min_length are not
+                expanded and are yielded as it is
+            block_size (int): max number of segments of cached iteration
+                default is chunk_size
+
+        Return:
+            (generator): chunks of lines (LineSet), in compute_on order
+                points may differ from compute_on ones by a unit of last
+                decimal (blocks are transformed by composed matrices)
+        """
+        block_size = chunk_size if block_size is None else block_size
+        level = min(n, max(self.max_iter(block_size), 0))
+        blocks = chain.from_iterable(
+            chain(
+                self._iter_blocks(matrix, n, level, region, min_length),
+                self._draw_blocks(matrix, n, level, region, min_length),
+            )
+            for matrix in get_matrices(BASIS_SEGMENT, segments)
+        )
+
+        chunk, size = [], 0
+        for block in blocks:
+            chunk.append(block)
+            size += block.n_segments
+            if size >= chunk_size:
+                yield compress(
+                    LineSet.concatenate(chunk), tolerance=self.tolerance
+                )
+                chunk, size = [], 0
+        if chunk:
+            yield compress(
+                LineSet.concatenate(chunk), tolerance=self.tolerance
+            )
+
+    def iter_levels(self, segments, n):
+        """Iterate on lines of iterations 0 to n on segments (from cache)"""
+        for k in range(n+1):
+            yield self.compute_on(segments, k)
+
+    def compute_in_region(self, segments, n, region,
+                          block_size=BLOCK_SEGMENTS):
+        """Compute n iterations of fractal operation on segments, only
+        expanding subtrees that might intersect region
+
+        Cost is proportional to the number of segments in region (plus
+        blocks of block_size segments around its border), not to q^n.
+
+        Args:
+            segments (list): list of segments (2-float-tuple)
+            n (int): number of iteration to compute
+            region (4-float-tuple): rectangle (x_min, x_max, y_min, y_max)
+            block_size (int): max number of segments of cached iteration
+
+        Return:
+            (LineSet): lines of subtrees intersecting region
+        """
+        return compress(LineSet.concatenate(self.iter_lines(
+            segments, n, region=region, block_size=block_size,
+        )), tolerance=self.tolerance)
+
+    def compute_lod(self, segments, n, min_length, region=None,
+                    max_segments=MAX_SEGMENTS):
+        """Compute n iterations of fractal operation on segments, segments
+        being expanded only while longer than min_length
+
+        Level of detail is adapted for each subtree: with min_length being
+        the length of a pixel (see Canvas.lod_length), long segments get
+        full detail and sub-pixel ones none.
+
+        The iteration tree is expanded level by level: the affine matrices
+        of the segments still to expand are a single stack, composed at
+        once with the basis matrices at each level.
+
+        Args:
+            segments (list): list of segments (2-float-tuple)
+            n (int): max number of iterations
+            min_length (float): length under which segments are kept as it is
+            region (4-float-tuple): rectangle (x_min, x_max, y_min, y_max)
+                subtrees out of it are not expanded
+            max_segments (int): max number of segments allowed for
+                computation (checked before expanding each level)
+
+        Return:
+            (LineSet): lines to draw
+        """
+        frontier = get_matrices(BASIS_SEGMENT, segments)
+        to_iter, to_draw = [], []
+        count = 0       # segments of lines to iter and draw so far
+        for k in range(n):
+            frontier = frontier[self.in_region(frontier, region)]
+            short = self.length(frontier) < min_length
+            to_iter.append(frontier[short])
+            frontier = frontier[~short]
+            if self.r:
+                to_draw.append(frontier)
+            count += short.sum() + self.r * len(frontier)
+            if max_segments and count + self.q * len(frontier) > max_segments:
+                raise SafetyError(
+                    f"Computing {k+1} iteration(s) with level of detail will"
+                    f" create more than {max_segments} segments"
+                )
+            frontier = compose(
+                frontier[:, np.newaxis], self.matrices
+            ).reshape(-1, 2, 3)
+        to_iter.append(frontier[self.in_region(frontier, region)])
+
+        lines = [transform_lines(
+            self.build_cache(0)[0], np.concatenate(to_iter),
+            decimals=self.decimals,
+        )]
+        if to_draw:
+            lines.append(transform_lines(
+                self.build_cache(1)[1], np.concatenate(to_draw),
+                decimals=self.decimals,
+            ))
+        return compress(LineSet.concatenate(lines), tolerance=self.tolerance)
+
+    @staticmethod
+    def length(matrix):
+        """Return length of BASIS_SEGMENT transformed by matrix (or by each
+        matrix of a stack)"""
+        return np.hypot(matrix[..., 0, 0], matrix[..., 1, 0])
+
+    def in_region(self, matrix, region):
+        """Whether lines of subtree from segment BASIS_SEGMENT transformed
+        by matrix (or by each matrix of a stack) might intersect region
+        (4-float-tuple)
+
+        Subtree lines are within a disc of radius radius*length around the
+        subtree segment middle.
+        """
+        if region is None:
+            return np.ones(np.shape(matrix)[:-2], dtype=bool)
+        radius = self.radius * self.length(matrix)
+        center = matrix[..., :, 2] + 0.5 * matrix[..., :, 0]
+        x_min, x_max, y_min, y_max = region
+        dx = np.maximum(np.maximum(x_min - center[..., 0], 0),
+                        center[..., 0] - x_max)
+        dy = np.maximum(np.maximum(y_min - center[..., 1], 0),
+                        center[..., 1] - y_max)
+        return dx*dx + dy*dy <= radius*radius
+
+    def _iter_blocks(self, matrix, n, level, region=None, min_length=None):
+        """Iterate on to-iter lines of iteration n transformed by matrix,
+        by blocks of cached iteration level"""
+        if not self.in_region(matrix, region):
+            return
+        if min_length and self.length(matrix) < min_length:
+            n = 0
+        if n <= level:
+            yield transform_lines(
+                self.build_cache(n)[0], [matrix], decimals=self.decimals
+            )
+            return
+        for matrix_b in compose(matrix, self.matrices):
+            yield from self._iter_blocks(
+                matrix_b, n-1, level, region, min_length
+            )
+
+    def _draw_blocks(self, matrix, n, level, region=None, min_length=None):
+        """Iterate on to-draw lines of iteration n transformed by matrix,
+        by blocks of cached iteration level"""
+        if not self.r or not self.in_region(matrix, region):
+            return
+        if min_length and self.length(matrix) < min_length:
+            return
+        if n <= level:
+            yield transform_lines(
+                self.build_cache(n)[1], [matrix], decimals=self.decimals
+            )
+            return
+        yield from self._draw_blocks(matrix, n-1, level, region, min_length)
+        for matrix_b in compose(matrix, self.matrices):
+            yield from self._draw_blocks(
+                matrix_b, n-1, level, region, min_length
+            )
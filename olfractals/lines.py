@@ -1,12 +1,155 @@
 """Helpers to manage lines
 
 A line is a numpy array of points (2 float array)
+A set of lines can be packed in a LineSet (one buffer of points + offsets)
 """
 import numpy as np
+from collections import defaultdict, deque
+from itertools import chain
+
+from .profiling import instrumented, measure_lines
 
 BASIS_SEGMENT = np.array([[0, 0], [1, 0]])
 
 
+# --------------------------------------------------------------------------- #
+# Line set
+
+class LineSet(object):
+
+    def __init__(self, points=None, offsets=None):
+        """Initiate a packed set of lines
+
+        Args:
+            points (matrix): 2d-matrix (n*2) of points of all lines
+            offsets (array): (m+1) indexes of points where each line starts,
+                first one being 0 and last one the total number of points
+                default is a single line made of all points
+        """
+        points = np.empty((0, 2)) if points is None else points
+        points = np.asanyarray(points)
+        if points.dtype.kind != 'f':
+            points = points.astype(float)
+        self.points = points.reshape(-1, 2)
+        if offsets is None:
+            offsets = [0, len(self.points)] if len(self.points) else [0]
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    @classmethod
+    def from_lines(cls, lines):
+        """Pack lines (iterable of lines or LineSet) in a LineSet"""
+        if isinstance(lines, cls):
+            return lines
+        lines = list(lines)
+        if not lines:
+            return cls()
+        offsets = np.zeros(len(lines)+1, dtype=np.int64)
+        np.cumsum([len(line) for line in lines], out=offsets[1:])
+        return cls(np.concatenate(lines), offsets)
+
+    @classmethod
+    def concatenate(cls, linesets):
+        """Concatenate line sets into a new one"""
+        linesets = [cls.from_lines(lines) for lines in linesets]
+        linesets = [lines for lines in linesets if len(lines)]
+        if not linesets:
+            return cls()
+        if len(linesets) == 1:
+            return linesets[0]
+        starts = np.cumsum([0] + [lines.n_points for lines in linesets])
+        offsets = np.concatenate([
+            lines.offsets[:-1] + start
+            for lines, start in zip(linesets, starts)
+        ] + [starts[-1:]])
+        points = np.concatenate([lines.points for lines in linesets])
+        return cls(points, offsets)
+
+    # ----------------------------------------------------------------------- #
+    # Information
+
+    @property
+    def n_points(self):
+        return int(self.offsets[-1])
+
+    @property
+    def n_segments(self):
+        return self.n_points - len(self)
+
+    @property
+    def nbytes(self):
+        return self.points.nbytes + self.offsets.nbytes
+
+    @property
+    def lengths(self):
+        """Number of points of each line"""
+        return np.diff(self.offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__}"
+            f" lines={len(self)} points={self.n_points}>"
+        )
+
+    # ----------------------------------------------------------------------- #
+    # Access
+
+    def __iter__(self):
+        points, offsets = self.points, self.offsets
+        for start, stop in zip(offsets[:-1], offsets[1:]):
+            yield points[start:stop]
+
+    def __getitem__(self, index):
+        """Return line view if index is an int, LineSet view if a slice"""
+        offsets = self.offsets
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return self.take(range(start, stop, step))
+            stop = max(start, stop)
+            return self.__class__(
+                self.points[offsets[start]:offsets[stop]],
+                offsets[start:stop+1] - offsets[start],
+            )
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("line index out of range")
+        return self.points[offsets[index]:offsets[index+1]]
+
+    def __add__(self, other):
+        return self.concatenate([self, other])
+
+    def take(self, indexes):
+        """Return new LineSet made of lines at given indexes"""
+        indexes = np.asarray(indexes, dtype=np.int64)
+        lengths = self.lengths[indexes]
+        offsets = np.zeros(len(indexes)+1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        shifts = np.repeat(self.offsets[indexes] - offsets[:-1], lengths)
+        return self.__class__(
+            self.points[shifts + np.arange(offsets[-1])], offsets
+        )
+
+    def astype(self, dtype):
+        """Return LineSet with points of given dtype (self if already is)"""
+        if self.points.dtype == dtype:
+            return self
+        return self.__class__(self.points.astype(dtype), self.offsets)
+
+    def lines(self):
+        """Return list of line views"""
+        return list(self)
+
+    def segments(self):
+        """Return 3d-array (n*2*2) of all segments"""
+        ends = self.offsets[1:] - 1
+        starts = np.delete(np.arange(self.n_points), ends)
+        return np.stack((self.points[starts], self.points[starts+1]), axis=1)
+
+
 # --------------------------------------------------------------------------- #
 # Lines
 
@@ -20,25 +163,109 @@ def assert_is_line(line):
 
 
 
-def compress(lines):
-    """Build reduced list of lines where consecutive lines are joined"""
-    # TODO: don't only linearly browse lines
-    c_lines = []
-    try:
-        c_line = lines[0]
-    except IndexError:
-        return np.array(lines)
-    start, end = c_line[0], c_line[-1]
-    for line in lines[1:]:
-        start = line[0]
-        if np.array_equal(start, end):
-            c_line = np.concatenate((c_line, line[1:]))
-        else:
-            c_lines.append(c_line)
-            c_line = line
-        end = c_line[-1]
-    c_lines.append(c_line)
-    return c_lines
+@instrumented('compress', measure_lines)
+def compress(lines, reorder=False, tolerance=None):
+    """Build reduced LineSet where consecutive lines are joined
+
+    Args:
+        lines (LineSet|list): lines to compress
+        reorder (bool): also join non-consecutive lines when one ends where
+            another starts (lines order is then not kept)
+        tolerance (float): max distance (on each axis) b/w end and start
+            points of joined lines, default is exact equality
+
+    Return:
+        (LineSet): compressed lines
+    """
+    lines = LineSet.from_lines(lines)
+    if len(lines) < 2:
+        return lines
+    if reorder:
+        lines = lines.take(chain_order(lines, tolerance=tolerance))
+
+    # Find lines starting where previous one ends
+    points, inner = lines.points, lines.offsets[1:-1]
+    joined = ends_match(points[inner-1], points[inner], tolerance)
+    dropped = inner[joined]
+
+    # Drop duplicated starts of joined lines in a single allocation
+    keep = np.ones(len(points), dtype=bool)
+    keep[dropped] = False
+    bounds = np.concatenate(([0], inner[~joined], [len(points)]))
+    return LineSet(points[keep], bounds - np.searchsorted(dropped, bounds))
+
+
+def ends_match(ends, starts, tolerance=None):
+    """Whether line ends match line starts (2d-matrices n*2), i.e. their
+    distance on each axis is at most tolerance (exact equality if None)
+
+    This is the rule of compress to join lines, reorder included.
+    """
+    if tolerance:
+        return np.all(np.abs(starts - ends) <= tolerance, axis=-1)
+    return np.all(starts == ends, axis=-1)
+
+
+class EndpointIndex(object):
+
+    def __init__(self, points, tolerance=None):
+        """Hash index of points (2d-matrix n*2) to find the ones matching a
+        point (see ends_match)
+
+        With tolerance, points are hashed by cell of a grid of tolerance
+        step: points matching a point are in its cell or neighbour ones.
+        """
+        self.points = points
+        self.tolerance = tolerance
+        self.cells = defaultdict(deque)
+        for i, key in enumerate(map(tuple, self._keys(points).tolist())):
+            self.cells[key].append(i)
+
+    def _keys(self, points):
+        return np.rint(points / self.tolerance) if self.tolerance else points
+
+    def find(self, point, skip=None):
+        """Iterate on indexes of points matching point, in index order by
+        cell; indexes where skip (bool array) is True are skipped (and
+        forgotten when at the front of their cell)"""
+        x, y = self._keys(point).tolist()
+        shifts = (-1, 0, 1) if self.tolerance else (0,)
+        for key in ((x + dx, y + dy) for dx in shifts for dy in shifts):
+            cell = self.cells.get(key)
+            if not cell:
+                continue
+            while skip is not None and cell and skip[cell[0]]:
+                cell.popleft()
+            for i in cell:
+                if (skip is None or not skip[i]) and ends_match(
+                    point, self.points[i], self.tolerance
+                ):
+                    yield i
+
+
+def chain_order(lines, tolerance=None):
+    """Return order of lines where lines are followed by one starting at
+    their end whenever possible (uses a hash index on line starts, lines
+    matching as in compress, see ends_match)
+    """
+    starts = lines.points[lines.offsets[:-1]]
+    ends = lines.points[lines.offsets[1:]-1]
+    start_index = EndpointIndex(starts, tolerance)
+    end_index = EndpointIndex(ends, tolerance)
+
+    # Start chains with lines no other line leads to, then loops
+    heads = [
+        i for i, start in enumerate(starts)
+        if next(end_index.find(start), None) is None
+    ]
+
+    order, used = [], np.zeros(len(lines), dtype=bool)
+    for i in chain(heads, range(len(lines))):
+        while i is not None and not used[i]:
+            order.append(i)
+            used[i] = True
+            i = next(start_index.find(ends[i], skip=used), None)
+    return order
 
 
 def line2seg(line):
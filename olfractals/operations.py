@@ -16,8 +16,8 @@ We define 2 types of operations:
 import numpy as np
 from functools import wraps
 
-from .lines import BASIS_SEGMENT, assert_is_line
-from .transformations import get_params, transform
+from .lines import BASIS_SEGMENT, LineSet, assert_is_line
+from .transformations import affine_transform, get_matrix
 
 
 # --------------------------------------------------------------------------- #
@@ -44,14 +44,16 @@ def basis2gen(b_oper):
 
     seg1 = BASIS_SEGMENT
     to_iter_base, to_draw_base = b_oper()
+    lines_base = LineSet.from_lines(list(to_iter_base) + list(to_draw_base))
+    i = len(to_iter_base)
 
     @wraps(b_oper)
     def oper_g(p1, p2):
-        seg2 = np.array([p1, p2])
-        params = get_params(seg1, seg2, as_radian=True)
-        to_iter = [transform(points, **params) for points in to_iter_base]
-        to_draw = [transform(points, **params) for points in to_draw_base]
-        return to_iter, to_draw
+        # Transform points of all lines at once
+        matrix = get_matrix(seg1, np.array([p1, p2]))
+        points = affine_transform(lines_base.points, [matrix])[0]
+        lines = LineSet(points, lines_base.offsets).lines()
+        return lines[:i], lines[i:]
 
     oper_g.__doc__ = (
             b_oper.__doc__
@@ -0,0 +1,119 @@
+"""Helpers to transform lines with a pool of processes
+
+A job transforms a range of lines of a source LineSet by a sequence of
+affine matrices (applied one after the other, points being rounded once
+after the last one).
+
+Source and output points are exchanged through shared memory so that big
+arrays are not pickled: each job writes its points at a position of the
+output buffer computed beforehand, which keeps output order deterministic.
+"""
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from .lines import LineSet
+from .transformations import affine_transform
+
+MIN_PARALLEL_POINTS = 1e5
+
+
+# --------------------------------------------------------------------------- #
+# Jobs
+
+def apply_job(source, output, job, position, decimals=3):
+    """Write in output at position the points of source transformed by job
+
+    Args:
+        source (matrix): 2d-matrix (n*2) of source points
+        output (matrix): 2d-matrix (m*2) of output points
+        job (tuple): (matrices, start, stop) to transform source[start:stop]
+            points with each matrix successively
+        position (int): index of output where to write transformed points
+        decimals (int): round points after last transformation
+    """
+    matrices, start, stop = job
+    points = source[start:stop]
+    for matrix in matrices[:-1]:
+        points = affine_transform(points, [matrix], decimals=None)[0]
+    # Last transformation is written in output directly
+    out = output[position:position+len(points)]
+    affine_transform(
+        points, matrices[-1:], decimals=decimals, out=out[np.newaxis]
+    )
+
+
+def _run_job(args):
+    """Run job in a worker process using shared memory buffers"""
+    (src_name, src_shape, out_name, out_shape, dtype, job, position,
+     decimals) = args
+    src_shm = shared_memory.SharedMemory(name=src_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        source = np.ndarray(src_shape, dtype=dtype, buffer=src_shm.buf)
+        output = np.ndarray(out_shape, dtype=dtype, buffer=out_shm.buf)
+        apply_job(source, output, job, position, decimals)
+        del source, output
+    finally:
+        src_shm.close()
+        out_shm.close()
+
+
+# --------------------------------------------------------------------------- #
+# Computation
+
+def transform_jobs(source, jobs, workers=None, decimals=3):
+    """Apply transformation jobs on lines, possibly in parallel
+
+    Args:
+        source (LineSet): lines to transform
+        jobs (list): list of (matrices, i, j) to transform lines source[i:j]
+            by each 2d affine matrix (2*3) of matrices successively
+        workers (int): number of processes to use
+            computation is serial if None, 1 or if source is small
+        decimals (int): round points after last transformation of jobs
+
+    Return:
+        (LineSet): concatenation of transformed lines in jobs order
+    """
+    source = LineSet.from_lines(source)
+    offsets, positions, p_jobs = [], [], []
+    position = 0
+    for matrices, i, j in jobs:
+        start, stop = source.offsets[i], source.offsets[j]
+        offsets.append(source.offsets[i:j] - start + position)
+        positions.append(position)
+        p_jobs.append((matrices, start, stop))
+        position += stop - start
+    offsets = np.concatenate(offsets + [[position]]).astype(np.int64)
+    dtype = source.points.dtype
+
+    if not workers or workers <= 1 or source.n_points < MIN_PARALLEL_POINTS:
+        output = np.empty((position, 2), dtype=dtype)
+        for job, position in zip(p_jobs, positions):
+            apply_job(source.points, output, job, position, decimals)
+        return LineSet(output, offsets)
+
+    src_shape, out_shape = source.points.shape, (position, 2)
+    src_shm = shared_memory.SharedMemory(
+        create=True, size=max(source.points.nbytes, 1)
+    )
+    out_shm = shared_memory.SharedMemory(
+        create=True, size=max(position * 2 * dtype.itemsize, 1)
+    )
+    try:
+        np.ndarray(src_shape, dtype=dtype, buffer=src_shm.buf)[:] = (
+            source.points
+        )
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_run_job, [
+                (src_shm.name, src_shape, out_shm.name, out_shape, dtype.str,
+                 job, pos, decimals)
+                for job, pos in zip(p_jobs, positions)
+            ]))
+        output = np.ndarray(out_shape, dtype=dtype, buffer=out_shm.buf).copy()
+    finally:
+        for shm in (src_shm, out_shm):
+            shm.close()
+            shm.unlink()
+    return LineSet(output, offsets)
@@ -0,0 +1,248 @@
+"""Cost model and planner of fractal computation and drawing
+
+The cost model gives the time spent per segment (or per point) by each
+way of computing lines, calibrated with a short benchmark on the current
+machine. The planner uses it to find, within a time and memory budget, the
+deepest iteration reachable and the strategy to get there:
+- memory   : compute all lines at once (Fractal.compute_on)
+- parallel : same with a pool of processes
+- stream   : compute and draw lines by chunks (Fractal.iter_lines), memory
+    being bounded whatever the depth
+- chaos    : draw points of the fractal limit (chaos.render), when exact
+    strategies can't reach the wanted depth
+
+    >>> model = CostModel.calibrate()
+    >>> plan = make_plan(fractal, segments, max_time=5, model=model)
+    >>> execute(plan, fractal, segments, Raster())
+"""
+import os
+from time import perf_counter
+
+from . import chaos
+from .canvas import get_bounds
+from .fractal import CHUNK_SIZE, MAX_SEGMENTS, Fractal
+from .raster import Raster
+
+STRATEGIES = ('memory', 'parallel', 'stream', 'chaos')
+CALIBRATION_SEGMENTS = 1e5
+DEFAULT_TIME = 10
+MAX_DEPTH = 64
+MAX_POINTS = 1e8
+PARALLEL_EFFICIENCY = 0.7
+POINT_BYTES = 64            # walker point, its map and its pixel
+
+_MODEL = {}                 # cost model calibrated by process
+
+
+# --------------------------------------------------------------------------- #
+# Cost model
+
+class CostModel(object):
+
+    def __init__(self, compute=2e-7, stream=4e-7, draw=3e-7, chaos=1e-6,
+                 parallel_efficiency=PARALLEL_EFFICIENCY):
+        """Initiate a cost model (default costs are rough estimates, use
+        calibrate to measure them on current machine)
+
+        Args:
+            compute (float): seconds to compute a segment in memory
+            stream (float): seconds to compute a segment by streaming
+            draw (float): seconds to draw a segment
+            chaos (float): seconds to generate and draw a point
+            parallel_efficiency (float): speedup of parallel computation by
+                worker process
+        """
+        self.compute = compute
+        self.stream = stream
+        self.draw = draw
+        self.chaos = chaos
+        self.parallel_efficiency = parallel_efficiency
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.to_dict()})"
+
+    def to_dict(self):
+        return {
+            'compute': self.compute,
+            'stream': self.stream,
+            'draw': self.draw,
+            'chaos': self.chaos,
+            'parallel_efficiency': self.parallel_efficiency,
+        }
+
+    @classmethod
+    def calibrate(cls, segments=CALIBRATION_SEGMENTS):
+        """Return cost model measured on current machine by running each
+        strategy on about segments segments of a dragon fractal (takes a
+        fraction of second for 1e5 segments)"""
+        from .collection import BasisOperation, StartSegment
+
+        def new_fractal():
+            return Fractal(BasisOperation.dragon, as_basis=True,
+                           engine='affine')
+
+        start_segments = StartSegment.horizontal
+        n = new_fractal().max_iter(segments)
+        count = new_fractal().evaluate_growth(n) * len(start_segments)
+        costs = {}
+
+        start = perf_counter()
+        lines = new_fractal().compute_on(start_segments, n)
+        costs['compute'] = (perf_counter() - start) / count
+
+        start = perf_counter()
+        for _ in new_fractal().iter_lines(start_segments, n):
+            pass
+        costs['stream'] = (perf_counter() - start) / count
+
+        raster = Raster()
+        raster.compute_fit_params(lines)
+        start = perf_counter()
+        raster.draw_lines(lines)
+        costs['draw'] = (perf_counter() - start) / count
+
+        start = perf_counter()
+        chaos.render(new_fractal(), start_segments, count, Raster())
+        costs['chaos'] = (perf_counter() - start) / count
+
+        return cls(**costs)
+
+    # ----------------------------------------------------------------------- #
+    # Estimations
+
+    def estimate(self, strategy, fractal, segments, n, workers=1, draw=True):
+        """Return estimated (time in seconds, memory in bytes) of computing
+        (and drawing) n iterations of fractal on segments with strategy
+
+        For chaos strategy, n is the number of points.
+        """
+        if strategy == 'chaos':
+            batch = min(n, chaos.BATCH_POINTS)
+            return n * self.chaos, batch * POINT_BYTES
+
+        count = fractal.evaluate_growth(n) * len(segments)
+        draw_time = count * self.draw if draw else 0
+        if strategy == 'stream':
+            # Cached block iteration and a chunk (plus its compressed copy)
+            level = max(fractal.max_iter(CHUNK_SIZE), 0)
+            memory = (
+                fractal.evaluate_memory(min(n, level))
+                + 2 * CHUNK_SIZE * fractal.bytes_per_segment
+            )
+            return count * self.stream + draw_time, memory
+
+        memory = (
+            fractal.evaluate_memory(n) + count * fractal.bytes_per_segment
+        )
+        if strategy == 'parallel':
+            # Shared memory copies of source and output
+            speedup = max(workers * self.parallel_efficiency, 1)
+            return (
+                count * self.compute / speedup + draw_time,
+                memory + count * fractal.bytes_per_segment,
+            )
+        return count * self.compute + draw_time, memory
+
+
+def default_model():
+    """Return cost model calibrated on current machine, once by process"""
+    if 'model' not in _MODEL:
+        _MODEL['model'] = CostModel.calibrate()
+    return _MODEL['model']
+
+
+# --------------------------------------------------------------------------- #
+# Planning
+
+def _deepest(model, strategy, fractal, segments, max_time, max_bytes,
+             workers, draw):
+    """Return deepest iteration within budgets and its estimations"""
+    best = None
+    for n in range(MAX_DEPTH + 1):
+        # In memory computation is limited by Fractal safety checks
+        if strategy != 'stream' and fractal.evaluate_growth(n) > MAX_SEGMENTS:
+            break
+        time, memory = model.estimate(
+            strategy, fractal, segments, n, workers=workers, draw=draw
+        )
+        if time > max_time or (max_bytes and memory > max_bytes):
+            break
+        best = n, time, memory
+    return best
+
+
+def make_plan(fractal, segments, max_time=DEFAULT_TIME, max_bytes=None,
+              depth=None, model=None, workers=None, draw=True):
+    """Return the plan reaching the deepest iteration within budgets
+
+    Exact strategies are compared on the deepest iteration they reach (the
+    fastest one wins ties). If wanted depth can't be reached, the chaos game
+    is planned with as many points as the time budget allows.
+
+    Args:
+        fractal (Fractal): fractal to compute
+        segments (list): list of segments (2-float-tuple)
+        max_time (float): time budget in seconds
+        max_bytes (int): memory budget in bytes
+        depth (int): wanted number of iterations
+        model (CostModel): cost model, default is calibrated on first use
+            (see default_model)
+        workers (int): number of processes for parallel strategy
+            default is number of CPUs
+        draw (bool): include drawing in time estimation
+
+    Return:
+        (dict): strategy, iterations (n), points (for chaos), workers and
+            estimated time and bytes
+    """
+    model = default_model() if model is None else model
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    strategies = ['memory', 'stream'] + (
+        ['parallel'] if workers > 1 and fractal.engine == 'affine' else []
+    )
+
+    best = None
+    for strategy in strategies:
+        found = _deepest(model, strategy, fractal, segments, max_time,
+                         max_bytes, workers, draw)
+        if found is None:
+            continue
+        n, time, memory = found
+        if best is None or (n, -time) > (best['n'], -best['time']):
+            best = {
+                'strategy': strategy, 'n': n, 'points': None,
+                'workers': workers if strategy == 'parallel' else None,
+                'time': time, 'bytes': memory,
+            }
+
+    if best is None or (depth is not None and best['n'] < depth):
+        points = int(min(max_time / model.chaos, MAX_POINTS))
+        time, memory = model.estimate('chaos', fractal, segments, points)
+        return {
+            'strategy': 'chaos', 'n': depth, 'points': points,
+            'workers': None, 'time': time, 'bytes': memory,
+        }
+    if depth is not None and best['n'] > depth:
+        best['n'] = depth
+        best['time'], best['bytes'] = model.estimate(
+            best['strategy'], fractal, segments, depth,
+            workers=best['workers'] or 1, draw=draw,
+        )
+    return best
+
+
+def execute(plan, fractal, segments, canvas):
+    """Draw fractal on segments on canvas (Raster, or opened Screen for
+    exact strategies) following plan"""
+    strategy, n = plan['strategy'], plan['n']
+    if strategy == 'chaos':
+        return chaos.render(fractal, segments, plan['points'], canvas)
+    if strategy == 'stream':
+        canvas.compute_fit_params(bounds=fractal.bounds(n, segments))
+        for lines in fractal.iter_lines(segments, n):
+            canvas.draw_lines(lines)
+        return canvas
+    lines = fractal.compute_on(segments, n, workers=plan['workers'])
+    canvas.compute_fit_params(bounds=get_bounds(lines))
+    canvas.draw_lines(lines)
+    return canvas
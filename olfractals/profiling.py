@@ -0,0 +1,160 @@
+"""Opt-in instrumentation of computation and drawing pipeline
+
+Instrumented stages (functions decorated with instrumented, or code
+between start and stop calls) record their wall time, number of calls,
+number of segments and bytes allocated in the active profilers. With no
+active profiler, instrumentation only costs a check of an empty list.
+
+    >>> with profile() as profiler:
+    ...     fractal.compute_on(segments, n)
+    >>> profiler.summary()
+"""
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from time import perf_counter
+
+_PROFILERS = []
+_LEVELS = []
+
+
+# --------------------------------------------------------------------------- #
+# Profiler
+
+def _measures():
+    return {'calls': 0, 'time': 0., 'segments': 0, 'bytes': 0}
+
+
+class Profiler(object):
+
+    def __init__(self, callback=None):
+        """Initiate a profiler, active when used as context manager
+
+        Args:
+            callback (callable): called with (stage, measures) each time a
+                stage ends, measures being a dict with time, segments, bytes
+                and level keys
+        """
+        self.callback = callback
+        self.stages = defaultdict(_measures)
+        self.levels = defaultdict(lambda: defaultdict(_measures))
+
+    def __enter__(self):
+        _PROFILERS.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _PROFILERS.remove(self)
+
+    def record(self, stage, duration, segments=0, nbytes=0, level=None):
+        """Record a stage run
+
+        Args:
+            stage (str): name of stage
+            duration (float): wall time of stage in seconds
+            segments (int): number of segments handled
+            nbytes (int): number of bytes allocated
+            level (int): iteration level handled
+        """
+        totals = [self.stages[stage]]
+        if level is not None:
+            totals.append(self.levels[level][stage])
+        for measures in totals:
+            measures['calls'] += 1
+            measures['time'] += duration
+            measures['segments'] += segments
+            measures['bytes'] += nbytes
+        if self.callback:
+            self.callback(stage, {
+                'time': duration, 'segments': segments, 'bytes': nbytes,
+                'level': level,
+            })
+
+    def summary(self):
+        """Return measures by stage and by iteration level"""
+        return {
+            'stages': {stage: dict(m) for stage, m in self.stages.items()},
+            'levels': {
+                level: {stage: dict(m) for stage, m in stages.items()}
+                for level, stages in sorted(self.levels.items())
+            },
+        }
+
+
+def profile(callback=None):
+    """Return a profiler to use as context manager"""
+    return Profiler(callback=callback)
+
+
+# --------------------------------------------------------------------------- #
+# Instrumentation
+
+def is_active():
+    """Whether a profiler is active"""
+    return bool(_PROFILERS)
+
+
+def start():
+    """Return start time of a stage, None if no profiler is active"""
+    return perf_counter() if _PROFILERS else None
+
+
+@contextmanager
+def at_level(level):
+    """Context where stages are recorded as run for iteration level"""
+    _LEVELS.append(level)
+    try:
+        yield
+    finally:
+        _LEVELS.pop()
+
+
+def stop(stage, start_time, segments=0, nbytes=0, level=None):
+    """Record stage started at start_time in active profilers
+
+    Return:
+        (float): duration of stage, None if no profiler is active
+    """
+    if start_time is None:
+        return None
+    duration = perf_counter() - start_time
+    if level is None and _LEVELS:
+        level = _LEVELS[-1]
+    for profiler in _PROFILERS:
+        profiler.record(stage, duration, segments, nbytes, level)
+    return duration
+
+
+def instrumented(stage, measure=None):
+    """Decorate function to record its runs as stage
+
+    Args:
+        stage (str): name of stage
+        measure (callable): return (segments, bytes) from function result
+    """
+    def decorator(func):
+
+        @wraps(func)
+        def wrapped(*args, **kwargs):
+            if not _PROFILERS:
+                return func(*args, **kwargs)
+            start_time = perf_counter()
+            result = func(*args, **kwargs)
+            segments, nbytes = (0, 0) if measure is None else measure(result)
+            stop(stage, start_time, segments, nbytes)
+            return result
+
+        return wrapped
+
+    return decorator
+
+
+def measure_lines(lines):
+    """Return (segments, bytes) of a LineSet"""
+    return lines.n_segments, lines.nbytes
+
+
+def measure_points(points):
+    """Return (segments, bytes) of an array of points (n*2 or k*n*2)"""
+    lines = points.shape[0] if points.ndim == 3 else 1
+    return max(points.size // 2 - lines, 0), points.nbytes
@@ -0,0 +1,289 @@
+"""Offscreen drawing of lines in a NumPy image buffer
+
+Segments are rasterized all at once: each segment is sampled at every
+pixel along its longest axis (DDA) and samples are written in the image
+with fancy indexing, without any display (works on headless machines).
+
+Points (as generated by the chaos game) can also be drawn, either as
+single pixels or accumulated in a density buffer drawn with a color
+intensity growing with the number of points in each pixel.
+"""
+import numpy as np
+import struct
+import zlib
+
+from . import profiling
+from .canvas import Canvas
+from .lines import LineSet
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+BATCH_PIXELS = 1e7
+
+
+# --------------------------------------------------------------------------- #
+# Rasterization
+
+def clip_segments(segments, x_max, y_max):
+    """Clip segments to rectangle [0, x_max]*[0, y_max] (Liang-Barsky)
+
+    Args:
+        segments (array): 3d-array (n*2*2) of segments
+        x_max (float): rectangle width
+        y_max (float): rectangle height
+
+    Return:
+        (array): 3d-array (m*2*2) of clipped segments, those out of rectangle
+            are removed
+    """
+    p1, delta = segments[:, 0], segments[:, 1] - segments[:, 0]
+    t0, t1 = np.zeros(len(segments)), np.ones(len(segments))
+    keep = np.ones(len(segments), dtype=bool)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for p, q in [
+            (-delta[:, 0], p1[:, 0]), (delta[:, 0], x_max - p1[:, 0]),
+            (-delta[:, 1], p1[:, 1]), (delta[:, 1], y_max - p1[:, 1]),
+        ]:
+            keep &= (p != 0) | (q >= 0)
+            t = q / p
+            t0 = np.where(p < 0, np.maximum(t0, t), t0)
+            t1 = np.where(p > 0, np.minimum(t1, t), t1)
+    keep &= t0 <= t1
+    p1, delta, t0, t1 = p1[keep], delta[keep], t0[keep], t1[keep]
+    return np.stack((
+        p1 + t0[:, np.newaxis] * delta,
+        p1 + t1[:, np.newaxis] * delta,
+    ), axis=1)
+
+
+def segment_pixels(segments):
+    """Return (x, y) integer coordinates of pixels covered by segments
+
+    Args:
+        segments (array): 3d-array (n*2*2) of segments (in pixels)
+
+    Return:
+        (2-array-tuple): x and y coordinates of covered pixels
+    """
+    p1, delta = segments[:, 0], segments[:, 1] - segments[:, 0]
+    steps = np.ceil(np.abs(delta).max(axis=1)).astype(np.int64)
+    counts = steps + 1
+    index = np.repeat(np.arange(len(segments)), counts)
+    starts = np.cumsum(counts) - counts
+    t = (np.arange(counts.sum()) - starts[index]) / np.maximum(steps, 1)[index]
+    points = p1[index] + delta[index] * t[:, np.newaxis]
+    pixels = np.rint(points).astype(np.int64)
+    return pixels[:, 0], pixels[:, 1]
+
+
+def clip_image_segments(segments, size, width=1):
+    """Clip segments (in pixels) to image of size (width, height), keeping
+    parts out of image by less than line width (their pixels may be in)"""
+    pad = width // 2
+    return clip_segments(
+        np.asarray(segments, dtype=float) + pad,
+        size[0] - 1 + 2 * pad, size[1] - 1 + 2 * pad,
+    ) - pad
+
+
+def rasterize(image, segments, color, width=1, clip=True):
+    """Draw segments (in pixels) in image
+
+    Args:
+        image (array): 3d-array (height*width*channels) of pixels
+        segments (array): 3d-array (n*2*2) of segments
+        color (tuple): color of segments
+        width (int): width of segments in pixels
+        clip (bool): clip segments to image before sampling their pixels
+            (segments already clipped to a bigger image, e.g. split in
+            tiles, must not be clipped again to get the same pixels)
+    """
+    height, length = image.shape[:2]
+    shifts = np.arange(width) - (width - 1) // 2
+    if clip:
+        segments = clip_image_segments(segments, (length, height), width)
+    segments = np.asarray(segments, dtype=float)
+    if not len(segments):
+        return
+
+    # Bound memory by rasterizing segments by batches
+    sizes = np.abs(segments[:, 1] - segments[:, 0]).max(axis=1) + 2
+    batches = np.cumsum(sizes) // BATCH_PIXELS
+    bounds = np.searchsorted(batches, np.arange(batches[-1] + 2))
+    for start, stop in zip(bounds[:-1], bounds[1:]):
+        if start == stop:
+            continue
+        x, y = segment_pixels(segments[start:stop])
+        for dx in shifts:
+            for dy in shifts:
+                px, py = x + dx, y + dy
+                inside = (px >= 0) & (px < length) & (py >= 0) & (py < height)
+                image[py[inside], px[inside]] = color
+
+
+# --------------------------------------------------------------------------- #
+# Image files
+
+class PNGWriter(object):
+
+    def __init__(self, path, size):
+        """Initiate a PNG file written by strips of rows
+
+        Args:
+            path (str): path of png file
+            size (2-int-tuple): width and height of image
+        """
+        self.size = size
+        self.rows = 0
+        self.file = open(path, 'wb')
+        self.compressor = zlib.compressobj()
+        self.file.write(PNG_SIGNATURE)
+        header = struct.pack('>IIBBBBB', *size, 8, 2, 0, 0, 0)
+        self._write_chunk(b'IHDR', header)
+
+    def _write_chunk(self, tag, data):
+        self.file.write(struct.pack('>I', len(data)))
+        self.file.write(tag + data)
+        crc = zlib.crc32(tag + data) & 0xffffffff
+        self.file.write(struct.pack('>I', crc))
+
+    def write(self, rows):
+        """Write rows (3d-array height*width*3 of uint8) below previous ones"""
+        rows = np.asarray(rows, dtype=np.uint8)
+        assert rows.shape[1:] == (self.size[0], 3), "Unexpected rows shape"
+        filtered = np.zeros((len(rows), 1 + 3 * self.size[0]), dtype=np.uint8)
+        filtered[:, 1:] = rows.reshape(len(rows), -1)
+        data = self.compressor.compress(filtered.tobytes())
+        if data:
+            self._write_chunk(b'IDAT', data)
+        self.rows += len(rows)
+
+    def close(self):
+        """Terminate png file"""
+        assert self.rows == self.size[1], (
+            f"Wrote {self.rows} rows instead of {self.size[1]}"
+        )
+        self._write_chunk(b'IDAT', self.compressor.flush())
+        self._write_chunk(b'IEND', b'')
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        if exc_info[0] is None:
+            self.close()
+        else:
+            self.file.close()
+
+
+def write_png(path, image):
+    """Write image (3d-array height*width*3 of uint8) as png file"""
+    height, width = image.shape[:2]
+    with PNGWriter(path, (width, height)) as writer:
+        writer.write(image)
+
+
+def read_png(path):
+    """Read png file written by PNGWriter (8-bit RGB, no filtering) as image
+    (3d-array height*width*3 of uint8)"""
+    with open(path, 'rb') as file:
+        content = file.read()
+    if not content.startswith(PNG_SIGNATURE):
+        raise ValueError(f"{path} is not a png file")
+    data, i = [], len(PNG_SIGNATURE)
+    while i < len(content):
+        size, = struct.unpack('>I', content[i:i+4])
+        tag = content[i+4:i+8]
+        if tag == b'IHDR':
+            width, height = struct.unpack('>II', content[i+8:i+16])
+        elif tag == b'IDAT':
+            data.append(content[i+8:i+8+size])
+        i += size + 12
+    rows = np.frombuffer(zlib.decompress(b''.join(data)), dtype=np.uint8)
+    return rows.reshape(height, -1)[:, 1:].reshape(height, width, 3)
+
+
+# --------------------------------------------------------------------------- #
+# Raster class
+
+class Raster(Canvas):
+
+    def __init__(self, size=(700, 700), line_params=None, flip_y=False):
+        """Initiate an offscreen Raster object"""
+        super().__init__(size=size, line_params=line_params, flip_y=flip_y)
+        self.image = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        self.density = None
+        self.clean()
+
+    def clean(self):
+        """Clean what is on image (and reset density)"""
+        self.image[:] = self.background
+        self.density = None
+
+    def draw_lines(self, lines, fit=True, color=None, width=None):
+        """Draw lines (LineSet or list of lines) on image"""
+        start = profiling.start()
+        segments = LineSet.from_lines(lines).segments()
+        if fit:
+            points = segments.reshape(-1, 2)
+            self.fit_transform(points, out=points)
+        color = self.line_params['color'] if color is None else color
+        width = self.line_params['width'] if width is None else width
+        rasterize(self.image, segments, color, width)
+        profiling.stop('draw', start, len(segments), segments.nbytes)
+
+    def draw_line(self, line, fit=True, **params):
+        """Draw line on image"""
+        self.draw_lines([line], fit=fit, **params)
+
+    def _pixels(self, points, fit=True):
+        """Return x and y coordinates of pixels of points within image"""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if fit:
+            points = self.fit_transform(points)
+        pixels = np.rint(points).astype(np.int64)
+        x, y = pixels[:, 0], pixels[:, 1]
+        inside = (x >= 0) & (x < self.size[0]) & (y >= 0) & (y < self.size[1])
+        return x[inside], y[inside]
+
+    def draw_points(self, points, fit=True, color=None):
+        """Draw points (2d-matrix n*2) as single pixels on image"""
+        x, y = self._pixels(points, fit=fit)
+        color = self.line_params['color'] if color is None else color
+        self.image[y, x] = color
+
+    def add_density(self, points, fit=True):
+        """Count points (2d-matrix n*2) falling in each pixel of image"""
+        width, height = self.size
+        if self.density is None:
+            self.density = np.zeros((height, width), dtype=np.int64)
+        x, y = self._pixels(points, fit=fit)
+        counts = np.bincount(y * width + x, minlength=width * height)
+        self.density += counts.reshape(height, width)
+
+    def draw_density(self, color=None, gamma=0.5):
+        """Draw density on image, pixels going from background color (no
+        point) to color (max density)
+
+        Args:
+            color (tuple): color of densest pixels, default is line color
+            gamma (float): exponent applied on normalized density, lower
+                values make sparse pixels more visible
+        """
+        if self.density is None or not self.density.any():
+            return
+        color = self.line_params['color'] if color is None else color
+        intensity = (self.density / self.density.max()) ** gamma
+        background = np.array(self.background, dtype=float)
+        self.image[:] = np.rint(
+            background + intensity[:, :, np.newaxis] * (
+                np.array(color, dtype=float) - background
+            )
+        )
+
+    def save(self, path):
+        """Save image as png if path ends with .png, as raw rgb bytes else"""
+        if path.lower().endswith('.png'):
+            write_png(path, self.image)
+        else:
+            self.image.tofile(path)
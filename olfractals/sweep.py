@@ -0,0 +1,145 @@
+"""Computation of variants of a configurable basis operation
+
+Each variant of an operation over a parameter grid (e.g. dragon elbow_x
+and elbow_y) is a Fractal (affine engine), so that safety checks, caching
+and rounding are the Fractal ones. Affine matrices of basis segments of
+all variants are computed at once (a single batched get_matrices call on
+the to-iter segments of every variant) instead of one call by variant.
+
+    >>> sweep = Sweep(BasisOperation.dragon, param_grid(
+    ...     elbow_x=[0.4, 0.5, 0.6], elbow_y=[0.3, 0.5],
+    ... ))
+    >>> variants = sweep.compute_on(StartSegment.horizontal, 10)
+    >>> contact_sheet(variants, Raster(size=(900, 600))).save("sheet.png")
+"""
+import numpy as np
+from functools import partial
+from itertools import product
+
+from .fractal import MAX_SEGMENTS, Fractal, SafetyError
+from .lines import BASIS_SEGMENT, LineSet
+from .raster import Raster
+from .transformations import get_matrices
+
+
+def param_grid(**values):
+    """Return list of params of cartesian product of values
+
+        >>> param_grid(elbow_x=[0.4, 0.5], elbow_y=[0.5])
+        [{'elbow_x': 0.4, 'elbow_y': 0.5}, {'elbow_x': 0.5, 'elbow_y': 0.5}]
+    """
+    names = list(values)
+    return [dict(zip(names, combo)) for combo in product(*values.values())]
+
+
+# --------------------------------------------------------------------------- #
+# Sweep
+
+class Sweep(object):
+
+    def __init__(self, func, grid, decimals=3):
+        """Initiate a sweep of a basis operation over a parameter grid
+
+        Args:
+            func (callable): basis operation taking grid params as kwargs
+            grid (list): list of params (dict) of each variant
+                see param_grid
+            decimals (int): round points of output lines
+        """
+        self.func = func
+        self.grid = list(grid)
+        self.fractals = [
+            Fractal(partial(func, **params), as_basis=True, engine='affine',
+                    decimals=decimals)
+            for params in self.grid
+        ]
+
+        # Matrices of all variants at once, split by variant
+        segments = [
+            fractal.basis_output[0].segments() for fractal in self.fractals
+        ]
+        matrices = get_matrices(
+            BASIS_SEGMENT, np.concatenate(segments).reshape(-1, 2, 2)
+        )
+        bounds = np.cumsum([len(variant) for variant in segments])[:-1]
+        for fractal, variant in zip(self.fractals,
+                                    np.split(matrices, bounds)):
+            fractal.matrices = variant
+
+    def __len__(self):
+        return len(self.grid)
+
+    def evaluate_growth(self, n):
+        """Return number of segments of all variants after n iterations"""
+        return sum(fractal.evaluate_growth(n) for fractal in self.fractals)
+
+    def compute_on(self, segments, n, max_segments=MAX_SEGMENTS):
+        """Compute n iterations of each variant on segments
+
+        Args:
+            segments (list): list of segments (2-float-tuple)
+            n (int): number of iterations
+            max_segments (int): max number of segments of all variants
+
+        Return:
+            (list): LineSet of each variant, in grid order
+        """
+        if max_segments and self.evaluate_growth(n) > max_segments:
+            raise SafetyError(
+                f"Computing {n} iteration(s) of {len(self)} variants will"
+                f" create more than {max_segments} segments"
+            )
+        return [
+            fractal.compute_on(segments, n) for fractal in self.fractals
+        ]
+
+
+# --------------------------------------------------------------------------- #
+# Contact sheet
+
+def contact_sheet(variants, raster=None, columns=None, cell_ratio=0.8,
+                  color=None, width=None):
+    """Draw each variant in its own cell of a grid on raster, all variants
+    being fitted and drawn at once
+
+    Args:
+        variants (list): LineSet of each variant
+        raster (Raster): where to draw, default is a 700*700 one
+        columns (int): number of columns of grid, default makes it square
+        cell_ratio (float): ratio of cell used by variant lines
+        color (tuple): color of lines
+        width (int): width of lines
+
+    Return:
+        (Raster): raster with variants drawn
+    """
+    raster = Raster() if raster is None else raster
+    columns = columns or int(np.ceil(np.sqrt(len(variants))))
+    rows = int(np.ceil(len(variants) / columns))
+    cell = np.array([raster.size[0] / columns, raster.size[1] / rows])
+
+    lines = LineSet.concatenate(variants)
+    if not len(lines):
+        return raster
+    sizes = np.array([variant.n_points for variant in variants])
+    index = np.repeat(np.arange(len(variants)), sizes)
+    starts = (np.cumsum(sizes) - sizes)[sizes > 0]
+
+    # Fit each variant bounds in its cell (same as Canvas fit, by variant)
+    p_min = np.zeros((len(variants), 2))
+    p_max = np.ones((len(variants), 2))
+    p_min[sizes > 0] = np.minimum.reduceat(lines.points, starts)
+    p_max[sizes > 0] = np.maximum.reduceat(lines.points, starts)
+    delta = np.maximum(p_max - p_min, 1e-9)
+    factors = cell_ratio * np.min(cell / delta, axis=1)
+    cells = np.arange(len(variants))
+    centers = cell * (np.stack((cells % columns, cells // columns), axis=1)
+                      + 0.5)
+    scale = np.where(raster.flip_y, [1, -1], [1, 1]) * factors[:, np.newaxis]
+    points = (
+        (lines.points - ((p_min + p_max) / 2)[index]) * scale[index]
+        + centers[index]
+    )
+    raster.draw_lines(LineSet(points, lines.offsets), fit=False,
+                      color=color, width=width)
+    return raster
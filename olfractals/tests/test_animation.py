@@ -0,0 +1,77 @@
+import os
+
+from olfractals import animation
+from olfractals.cache import DiskCache
+
+
+def test_interpolate():
+    frames = animation.interpolate({'a': 0, 'b': 1}, {'a': 1, 'b': 1}, 3)
+    assert frames == [{'a': 0, 'b': 1}, {'a': 0.5, 'b': 1}, {'a': 1, 'b': 1}]
+
+
+def test_animate_iterations(tmp_path):
+    from olfractals.collection import BasisOperation, StartSegment
+
+    directory = str(tmp_path / "frames")
+    paths = animation.animate_iterations(
+        BasisOperation.dragon, StartSegment.horizontal, 6, directory,
+        size=(40, 40),
+    )
+    assert paths == [
+        os.path.join(directory, f"frame_0000{k}.png") for k in range(7)
+    ]
+    assert all(os.path.getsize(path) for path in paths)
+    assert max(animation._FRACTAL['fractal'].cache) == 6
+
+    # Frames on disk are kept
+    mtimes = [os.stat(path).st_mtime_ns for path in paths]
+    animation.animate_iterations(
+        BasisOperation.dragon, StartSegment.horizontal, 6, directory,
+        size=(40, 40),
+    )
+    assert [os.stat(path).st_mtime_ns for path in paths] == mtimes
+
+
+def test_animate_params(tmp_path):
+    from olfractals.collection import BasisOperation, StartSegment
+
+    args = (BasisOperation.dragon, StartSegment.horizontal, 5)
+    params = {
+        'start': {'elbow_x': 0.5, 'elbow_y': 0.5},
+        'stop': {'elbow_x': 0.6, 'elbow_y': 0.4},
+        'n_frames': 4, 'size': (40, 40),
+    }
+    serial = animation.animate_params(
+        *args, str(tmp_path / "serial"), **params
+    )
+    parallel = animation.animate_params(
+        *args, str(tmp_path / "parallel"), workers=2,
+        disk_cache=DiskCache(str(tmp_path / "cache")), **params
+    )
+    assert len(serial) == len(parallel) == 4
+    for path_s, path_p in zip(serial, parallel):
+        with open(path_s, 'rb') as file_s, open(path_p, 'rb') as file_p:
+            assert file_s.read() == file_p.read()
+    with open(serial[0], 'rb') as file_0, open(serial[-1], 'rb') as file_1:
+        assert file_0.read() != file_1.read()
+
+
+def test_save_frame(tmp_path):
+    import pytest
+    from olfractals.raster import Raster
+
+    path = str(tmp_path / "frame.png")
+    animation.save_frame(Raster(size=(10, 10)), path)
+    assert os.listdir(str(tmp_path)) == ["frame.png"]
+
+    # Failed writing leaves neither frame nor temporary file
+    class FailingRaster(Raster):
+        def save(self, path):
+            with open(path, 'wb') as file:
+                file.write(b'partial')
+            raise KeyboardInterrupt
+
+    other = str(tmp_path / "other.png")
+    with pytest.raises(KeyboardInterrupt):
+        animation.save_frame(FailingRaster(size=(10, 10)), other)
+    assert os.listdir(str(tmp_path)) == ["frame.png"]
@@ -0,0 +1,46 @@
+import json
+
+from olfractals import benchmark
+
+
+def test_run(tmp_path):
+
+    results = benchmark.run(
+        operations=['dragon', 'leaf'], starts=['triangle'],
+        max_segments=[10, 100], engines=['loop', 'affine'],
+    )
+    assert len(results['results']) == 8
+    case = results['results'][0]
+    assert (case['operation'], case['start'], case['engine']) == (
+        'dragon', 'triangle', 'loop'
+    )
+    assert sorted(case['stages']) == [
+        'build_cache', 'compress', 'compute_on', 'fit', 'render'
+    ]
+    assert sorted(case['stages']['render']) == [
+        'peak_bytes', 'segments_per_sec', 'time'
+    ]
+
+    path = str(tmp_path / "bench.json")
+    benchmark.save(results, path)
+    with open(path) as file:
+        assert json.load(file) == results
+
+
+def test_import_time():
+
+    # Compute modules don't load pygame, display is loaded on first use
+    for module in ['olfractals', 'olfractals.fractal', 'olfractals.planner',
+                   'olfractals.tiles', 'olfractals.animation']:
+        assert benchmark.import_time(module, repeat=1)[
+            'heavy_modules'
+        ] == [], module
+
+    # Startup stays close to NumPy one (pygame alone about doubles it)
+    startup = benchmark.import_time('olfractals')
+    assert startup['time'] < 2 * benchmark.import_time('numpy')['time']
+
+    import olfractals
+    from olfractals.display import Screen
+    assert olfractals.Screen is Screen
+    assert Screen().clock is None
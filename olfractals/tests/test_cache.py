@@ -0,0 +1,68 @@
+import numpy as np
+import os
+import pytest
+
+from olfractals.cache import DiskCache, KeepLast, MemoryBudget
+from olfractals.fractal import Fractal, SafetyError
+
+
+def test_DiskCache(tmp_path):
+    from olfractals.collection import BasisOperation
+
+    disk_cache = DiskCache(str(tmp_path))
+    dragon, spiral = BasisOperation.dragon, BasisOperation.spiral
+    fractal = Fractal(dragon, as_basis=True, disk_cache=disk_cache)
+    to_iter, to_draw = fractal.build_cache(3)
+    assert len(disk_cache.entries()) == 2   # iterations 2 and 3
+
+    # Iteration is reloaded memory-mapped
+    fractal = Fractal(dragon, as_basis=True, disk_cache=disk_cache)
+    c_iter, c_draw = fractal.build_cache(3)
+    assert 2 not in fractal.cache
+    assert isinstance(c_iter.points, np.memmap)
+    np.testing.assert_equal(c_iter.points, to_iter.points)
+    np.testing.assert_equal(c_iter.offsets, to_iter.offsets)
+
+    # Other operations do not share entries
+    fractal = Fractal(spiral, as_basis=True, disk_cache=disk_cache)
+    fractal.build_cache(2)
+    assert len(disk_cache.entries()) == 3
+
+    # Least recently used entries are evicted
+    key = Fractal(dragon, as_basis=True).cache_key
+    os.utime(disk_cache.entry_path(key, 2), (0, 0))
+    disk_cache.max_bytes = disk_cache.size - 1
+    disk_cache.evict()
+    assert not os.path.exists(disk_cache.entry_path(key, 2))
+    assert os.path.exists(disk_cache.entry_path(key, 3))
+
+
+def test_CachePolicy():
+    from olfractals.collection import BasisOperation
+
+    dragon = BasisOperation.dragon
+    expected = Fractal(dragon, as_basis=True).compute_b(6)
+    assert len(Fractal(dragon, as_basis=True).cache) == 2
+
+    # Keep last iterations only
+    fractal = Fractal(dragon, as_basis=True, cache_policy=KeepLast(2))
+    fractal.compute_b(6)
+    assert sorted(fractal.cache) == [0, 1, 5, 6]
+    del fractal.cache[6]
+    lines = fractal.compute_b(6)
+    np.testing.assert_equal(lines.points, expected.points)
+
+    # Keep iterations within memory budget
+    max_bytes = fractal.evaluate_memory(6)
+    policy = MemoryBudget(max_bytes)
+    fractal = Fractal(dragon, as_basis=True, cache_policy=policy)
+    fractal.compute_b(6)
+    assert 6 in fractal.cache
+    assert sum(
+        lines.nbytes
+        for n, iteration in fractal.cache.items() if n > 1
+        for lines in iteration
+    ) <= max_bytes
+    assert fractal.max_iter(1e9) == 6
+    with pytest.raises(SafetyError):
+        fractal.compute_b(7)
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from olfractals.chaos import compute_points, iter_points, render
+from olfractals.fractal import Fractal
+from olfractals.raster import Raster
+
+
+def test_iter_points():
+    from olfractals.collection import BasisOperation, StartSegment
+
+    for b_oper in [BasisOperation.dragon, BasisOperation.leaf]:
+        fractal = Fractal(b_oper, as_basis=True)
+        chunks = list(iter_points(
+            fractal, StartSegment.triangle, 25000, batch_size=1e4, seed=0
+        ))
+        assert [len(chunk) for chunk in chunks] == [10000, 10000, 5000]
+        points = np.concatenate(chunks)
+        np.testing.assert_equal(points, compute_points(
+            fractal, StartSegment.triangle, 25000, batch_size=1e4, seed=0
+        ))
+
+        # Points are within discs around segments of a deeper iteration
+        segments = fractal.compute_on(StartSegment.triangle, 6).segments()
+        p1, delta = segments[:, 0], segments[:, 1] - segments[:, 0]
+        lengths = np.linalg.norm(delta, axis=1)
+        for point in points[:200]:
+            t = np.sum((point - p1) * delta, axis=1)
+            t = np.clip(t / np.maximum(lengths**2, 1e-12), 0, 1)
+            distances = np.linalg.norm(p1 + t[:, np.newaxis] * delta - point,
+                                       axis=1)
+            assert distances.min() <= fractal.radius * lengths.max()
+
+
+def test_render():
+    from olfractals.collection import BasisOperation, StartSegment
+
+    fractal = Fractal(BasisOperation.dragon, as_basis=True)
+    raster = render(
+        fractal, StartSegment.horizontal, 1e5, Raster(size=(50, 50)), seed=1
+    )
+    assert raster.density.sum() > 0.9e5
+    drawn = np.any(raster.image != 255, axis=2)
+    assert drawn.sum() == (raster.density > 0).sum()
+
+    raster = render(
+        fractal, StartSegment.horizontal, 1e4, Raster(size=(50, 50)),
+        density=False, seed=1,
+    )
+    assert raster.density is None
+    assert np.all(raster.image == 0, axis=2).any()
+
+    # Not contracting (to-iter segment longer than basis one)
+    fractal = Fractal(
+        lambda: ([np.array([(0, 0), (2, 0)])], []), as_basis=True
+    )
+    with pytest.raises(ValueError, match="contracting maps"):
+        next(iter_points(fractal, StartSegment.horizontal, 10))
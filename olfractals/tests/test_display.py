@@ -20,3 +20,70 @@ def test_Screen():
         screen.fit_transform(line),
         [[ 70., 490.], [350., 490.], [350., 210.], [630., 490.]],
     )
+
+
+def test_Screen_draw_lines():
+    import pygame
+
+    screen = Screen(size=(10, 10), line_params={'width': 1})
+    lines = [np.array([[0, 1], [1, 1]]), np.array([[1, 1], [1, 0], [2, 1]])]
+    screen.compute_fit_params(np.concatenate(lines))
+
+    # Draw on an offscreen surface
+    screen.screen = pygame.Surface(screen.size)
+    screen.clean()
+    screen.draw_lines(lines)
+    assert screen.screen.get_at((3, 7))[:3] == (0, 0, 0)
+    assert screen.screen.get_at((5, 5))[:3] == (0, 0, 0)
+    assert screen.screen.get_at((3, 3))[:3] == (255, 255, 255)
+
+
+def test_Screen_fit():
+    from olfractals.lines import LineSet
+
+    line = np.array([[0, 1], [1, 1], [1, 0], [2, 1]])
+    params = Screen().compute_fit_params(line)
+
+    # Fit params can be computed by chunks
+    screen = Screen()
+    chunks = (LineSet(line[i:i+2]) for i in range(0, 4, 2))
+    c_params = screen.compute_fit_params(chunks)
+    for key, value in params.items():
+        np.testing.assert_almost_equal(c_params[key], value)
+    assert screen.lod_length(2) == 2 / 280
+
+    # Fit in place, y-axis going up
+    screen.flip_y = True
+    points = line.astype(float)
+    screen.fit_transform(points, out=points)
+    np.testing.assert_almost_equal(
+        points, [[70., 210.], [350., 210.], [350., 490.], [630., 210.]],
+    )
+
+
+def test_Screen_stream():
+    import pygame
+
+    screen = Screen(size=(10, 10), line_params={'width': 1})
+    lines = [np.array([[0, 1], [1, 1]]), np.array([[1, 1], [1, 0], [2, 1]])]
+    screen.compute_fit_params(np.concatenate(lines))
+    screen.screen = pygame.Surface(screen.size)
+    screen.clean()
+
+    # Chunks are computed in producer thread then drawn
+    screen.stream(iter([[line] for line in lines])).join()
+    screen.draw_queued()
+    assert screen.screen.get_at((3, 7))[:3] == (0, 0, 0)
+    assert screen.screen.get_at((5, 5))[:3] == (0, 0, 0)
+
+    # Streaming stops when screen is closed
+    consumed = []
+
+    def chunks():
+        for line in lines:
+            consumed.append(line)
+            screen.stop = True
+            yield [line]
+
+    screen.stream(chunks()).join()
+    assert len(consumed) == 1
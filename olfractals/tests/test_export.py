@@ -0,0 +1,68 @@
+import numpy as np
+import xml.etree.ElementTree as ET
+
+from olfractals.export import (
+    iter_binary, load_binary, path_data, write_binary, write_svg
+)
+from olfractals.fractal import Fractal
+from olfractals.lines import LineSet
+from olfractals.raster import Raster
+
+
+def test_path_data():
+    lines = LineSet.from_lines([
+        np.array([[0, 1], [1, 1]]), np.array([[1, 0], [0.5, 2], [2, 1]])
+    ])
+    assert path_data(lines, decimals=1) == (
+        "M0.0,1.0 1.0,1.0M1.0,0.0 0.5,2.0 2.0,1.0"
+    )
+    assert path_data(LineSet()) == ""
+
+
+def test_write_svg(tmp_path):
+    from olfractals.collection import BasisOperation, StartSegment
+
+    fractal = Fractal(BasisOperation.leaf, as_basis=True)
+    segments, n = StartSegment.triangle, 4
+    chunks = list(fractal.iter_lines(segments, n, chunk_size=100))
+    path = str(tmp_path / "leaf.svg")
+    write_svg(path, iter(chunks), fractal.bounds(n, segments))
+
+    paths = ET.parse(path).getroot().findall('.//{*}path')
+    assert len(paths) == len(chunks)
+    data = "".join(element.get('d') for element in paths)
+    assert data.count('M') == sum(len(chunk) for chunk in chunks)
+
+
+def test_binary(tmp_path):
+    from olfractals.collection import BasisOperation, StartSegment
+
+    fractal = Fractal(BasisOperation.dragon, as_basis=True)
+    segments, n = StartSegment.star_3, 8
+    path = str(tmp_path / "dragon.bin")
+    write_binary(path, fractal.iter_lines(segments, n, chunk_size=100))
+
+    expected = LineSet.concatenate(
+        fractal.iter_lines(segments, n, chunk_size=100)
+    )
+    lines = load_binary(path)
+    assert isinstance(lines.points, np.memmap)
+    assert lines.points.dtype == np.float32
+    np.testing.assert_equal(lines.offsets, expected.offsets)
+    np.testing.assert_allclose(lines.points, expected.points, atol=1e-6)
+    np.testing.assert_equal(load_binary(path, mmap=False).points, lines.points)
+
+    # Chunks of memory-mapped lines can be drawn directly
+    chunks = list(iter_binary(path, chunk_size=500))
+    assert len(chunks) > 1
+    assert sum(len(chunk) for chunk in chunks) == len(lines)
+    raster1, raster2 = Raster(size=(50, 50)), Raster(size=(50, 50))
+    for raster in (raster1, raster2):
+        raster.compute_fit_params(lines)
+    for chunk in chunks:
+        raster1.draw_lines(chunk)
+    raster2.draw_lines(expected)
+    np.testing.assert_equal(raster1.image, raster2.image)
+
+    write_binary(path, [])
+    assert len(load_binary(path)) == 0
@@ -1,6 +1,7 @@
 import numpy as np
+import pytest
 
-from olfractals.fractal import Fractal
+from olfractals.fractal import Fractal, SafetyError
 
 
 def test_Fractal():
@@ -18,3 +19,221 @@ def test_Fractal():
     np.testing.assert_equal(lines[0], [
         [0., 0.], [-0.5, 0.866], [0.5, 0.866], [1.5, 0.866], [1., 0.]
     ])
+
+
+def test_Fractal_engines():
+    from olfractals.collection import BasisOperation, StartSegment
+
+    for b_oper in [BasisOperation.dragon, BasisOperation.leaf]:
+        f_loop = Fractal(b_oper, as_basis=True, engine='loop')
+        f_affine = Fractal(b_oper, as_basis=True, engine='affine')
+        for n in range(4):
+            lines_l = f_loop.compute_on(StartSegment.triangle, n)
+            lines_a = f_affine.compute_on(StartSegment.triangle, n)
+            assert len(lines_l) == len(lines_a)
+            for line_l, line_a in zip(lines_l, lines_a):
+                # Only rounding ties on last decimal might differ
+                np.testing.assert_allclose(line_l, line_a, atol=1e-3)
+
+
+def test_Fractal_loop_baseline():
+    from olfractals.collection import BasisOperation, StartSegment
+
+    # Loop engine output is unchanged (angles and rounding ties included)
+    fractal = Fractal(BasisOperation.spiral, as_basis=True, engine='loop')
+    np.testing.assert_equal(fractal.compute_b(2).points[:3], [
+        (0, 0), (0.188, 0.25), (0.313, 0),
+    ])
+    expected = {
+        'spiral': (82, (40.502, 23.382), 67.636),
+        'double_arrow': (1537, (768, 443.395), 1472.723),
+    }
+    for name, (n_points, sums, abs_sum) in expected.items():
+        fractal = Fractal(getattr(BasisOperation, name), as_basis=True,
+                          engine='loop')
+        points = fractal.compute_on(StartSegment.triangle, 3).points
+        assert len(points) == n_points
+        np.testing.assert_allclose(points.sum(axis=0), sums, atol=1e-9)
+        np.testing.assert_allclose(np.abs(points).sum(), abs_sum, atol=1e-9)
+
+
+def test_Fractal_precision():
+    from olfractals.collection import BasisOperation, StartSegment
+
+    f_64 = Fractal(BasisOperation.leaf, as_basis=True, engine='affine')
+    f_32 = Fractal(BasisOperation.leaf, as_basis=True, engine='affine',
+                   dtype=np.float32)
+    assert f_32.cache_key != f_64.cache_key
+    assert f_32.evaluate_memory(5) < f_64.evaluate_memory(5)
+    for n in range(1, 6):
+        lines_64 = f_64.compute_on(StartSegment.triangle, n)
+        lines_32 = f_32.compute_on(StartSegment.triangle, n)
+        assert lines_32.points.dtype == np.float32
+        assert all(lines.points.dtype == np.float32 for lines in f_32.cache[n])
+        np.testing.assert_equal(lines_32.offsets, lines_64.offsets)
+        np.testing.assert_allclose(lines_32.points, lines_64.points, atol=2e-3)
+    assert (
+        sum(lines.nbytes for lines in f_32.cache[5])
+        < 0.6 * sum(lines.nbytes for lines in f_64.cache[5])
+    )
+
+    # Output points are rounded, not cached ones
+    fractal = Fractal(BasisOperation.dragon, as_basis=True)
+    lines = fractal.compute_b(3)
+    np.testing.assert_equal(lines.points, np.round(lines.points, 3))
+    assert fractal.cache[3][0].n_points == lines.n_points
+    exact = Fractal(BasisOperation.dragon, as_basis=True, decimals=None)
+    assert exact.tolerance is None
+    np.testing.assert_allclose(exact.compute_b(3).points, lines.points,
+                               atol=1e-3)
+
+
+def test_Fractal_iter_lines():
+    from olfractals.collection import BasisOperation, StartSegment
+    from olfractals.lines import LineSet
+
+    fractal = Fractal(BasisOperation.leaf, as_basis=True)
+    n, chunk_size = 5, 500
+    chunks = list(
+        fractal.iter_lines(StartSegment.star_3, n, chunk_size=chunk_size)
+    )
+    assert len(chunks) > 1
+    assert all(chunk.n_segments >= chunk_size for chunk in chunks[:-1])
+    assert max(fractal.cache) < n
+
+    # Same segments in same order, up to a unit of last decimal (blocks are
+    # transformed by composed matrices, so points may round differently)
+    for b_oper in [BasisOperation.leaf, BasisOperation.spiral,
+                   BasisOperation.eve_dragon]:
+        fractal = Fractal(b_oper, as_basis=True)
+        chunks = fractal.iter_lines(StartSegment.star_5, 6, chunk_size=500)
+        expected = fractal.compute_on(StartSegment.star_5, 6)
+        np.testing.assert_allclose(
+            LineSet.concatenate(chunks).segments(), expected.segments(),
+            rtol=0, atol=1e-3 + 1e-9,
+        )
+
+
+def test_Fractal_workers():
+    from olfractals import parallel
+    from olfractals.collection import BasisOperation, StartSegment
+
+    expected = Fractal(
+        BasisOperation.leaf, as_basis=True, engine='affine'
+    ).compute_on(StartSegment.triangle, 4)
+    min_points, parallel.MIN_PARALLEL_POINTS = parallel.MIN_PARALLEL_POINTS, 0
+    try:
+        fractal = Fractal(BasisOperation.leaf, as_basis=True, engine='affine')
+        lines = fractal.compute_on(StartSegment.triangle, 4, workers=2)
+    finally:
+        parallel.MIN_PARALLEL_POINTS = min_points
+    np.testing.assert_equal(lines.offsets, expected.offsets)
+    np.testing.assert_equal(lines.points, expected.points)
+
+    # Parallel jobs don't round lines at each iteration as loop engine does
+    fractal = Fractal(BasisOperation.leaf, as_basis=True, engine='loop')
+    with pytest.raises(ValueError, match="affine engine"):
+        fractal.compute_on(StartSegment.triangle, 4, workers=2)
+    with pytest.raises(ValueError, match="affine engine"):
+        fractal.compute_b(4, workers=2)
+
+
+def test_Fractal_bounds():
+    from olfractals.canvas import get_bounds
+    from olfractals.collection import BasisOperation, StartSegment
+
+    for b_oper in [BasisOperation.dragon, BasisOperation.leaf]:
+        fractal = Fractal(b_oper, as_basis=True, engine='affine')
+        lines = fractal.compute_on(StartSegment.triangle, 8)
+        x_min, x_max, y_min, y_max = get_bounds(lines)
+
+        # Exact when computed iteration is reached
+        np.testing.assert_almost_equal(
+            fractal.bounds(8, StartSegment.triangle, max_segments=1e9),
+            (x_min, x_max, y_min, y_max),
+        )
+
+        # Upper bound close to exact bounds otherwise
+        b_min_x, b_max_x, b_min_y, b_max_y = fractal.bounds(
+            8, StartSegment.triangle, max_segments=1e3
+        )
+        assert 0 <= x_min - b_min_x < 0.1 and 0 <= b_max_x - x_max < 0.1
+        assert 0 <= y_min - b_min_y < 0.1 and 0 <= b_max_y - y_max < 0.1
+
+    # Non contracting operation needs every segment of iteration n
+    fractal = Fractal(
+        lambda: ([np.array([(0, 0), (1, 0), (1, 1)])], []), as_basis=True
+    )
+    assert np.isinf(fractal.radius)
+    assert fractal.bounds(3, max_segments=8) == get_bounds(
+        fractal.compute_b(3)
+    )
+    with pytest.raises(SafetyError):
+        fractal.bounds(4, max_segments=8)
+
+
+def test_Fractal_compute_in_region():
+    from olfractals.canvas import get_bounds
+    from olfractals.collection import BasisOperation, StartSegment
+
+    fractal = Fractal(BasisOperation.dragon, as_basis=True)
+    region = (0.2, 0.3, 0.1, 0.2)
+    lines = fractal.compute_in_region(
+        StartSegment.horizontal, 12, region, block_size=16
+    )
+    expected = fractal.compute_on(StartSegment.horizontal, 12)
+    assert 0 < lines.n_segments < expected.n_segments / 10
+
+    # Every segment in region is kept (up to rounding)
+    def in_region(segments):
+        x, y = segments[:, :, 0], segments[:, :, 1]
+        inside = (x >= 0.2) & (x <= 0.3) & (y >= 0.1) & (y <= 0.2)
+        return segments[inside.any(axis=1)].reshape(-1, 1, 4)
+
+    expected, segments = in_region(expected.segments()), lines.segments()
+    assert len(expected)
+    distances = np.abs(expected - segments.reshape(1, -1, 4)).max(axis=2)
+    assert np.all(distances.min(axis=1) < 5e-3)
+
+
+def test_Fractal_compute_lod():
+    from olfractals.collection import BasisOperation, StartSegment
+    from olfractals.lines import LineSet
+
+    b_oper = BasisOperation.configured(
+        BasisOperation.dragon, elbow_x=3/5, elbow_y=2/5
+    )
+    fractal = Fractal(b_oper, as_basis=True)
+    expected = fractal.compute_on(StartSegment.horizontal, 12)
+
+    # No segment is too short to be expanded
+    lines = fractal.compute_lod(StartSegment.horizontal, 12, 1e-9)
+    assert lines.n_segments == expected.n_segments
+
+    # Expansion stops once segments are short enough, depending on subtree
+    lines = fractal.compute_lod(StartSegment.horizontal, 12, 0.05)
+    p1, p2 = np.moveaxis(lines.segments(), 1, 0)
+    lengths = np.linalg.norm(p2 - p1, axis=1)
+    assert lines.n_segments < expected.n_segments / 10
+    assert np.all(lengths < 0.05) and np.all(lengths > 0.05 * 0.56)
+
+    # Same segments as the depth-first walk of iter_lines
+    def sorted_segments(lines):
+        segments = lines.segments().reshape(-1, 4)
+        return segments[np.lexsort(segments.T[::-1])]
+
+    region = (0.4, 0.6, -0.1, 0.1)
+    lines = fractal.compute_lod(StartSegment.horizontal, 12, 0.01, region)
+    walk = LineSet.concatenate(fractal.iter_lines(
+        StartSegment.horizontal, 12, region=region, min_length=0.01,
+        block_size=1,
+    ))
+    assert lines.n_segments
+    np.testing.assert_equal(sorted_segments(lines), sorted_segments(walk))
+
+    # Expansion is bounded like compute_on, but only by expanded segments
+    with pytest.raises(SafetyError):
+        fractal.compute_lod(StartSegment.horizontal, 30, 1e-9,
+                            max_segments=1e4)
+    assert fractal.compute_lod(StartSegment.horizontal, 30, 0.05,
+                               max_segments=1e4).n_segments < 1e4
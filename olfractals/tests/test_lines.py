@@ -17,4 +17,73 @@ def test_all():
     line = np.array([[0, 1], [1, 1], [1, 0], [2, 1]])
     points = [[(0, 1), (1, 1)], [(1, 1), (1, 0)], [(1, 0), (2, 1)]]
     for cseg, eseg in zip(lib.line2seg(line), points):
-        np.testing.assert_equal(cseg, eseg)
\ No newline at end of file
+        np.testing.assert_equal(cseg, eseg)
+
+def test_LineSet():
+
+    l1 = np.array([[0, 1], [1, 1]])
+    l2 = np.array([[1, 1], [1, 0], [2, 1]])
+    lines = lib.LineSet.from_lines([l1, l2])
+    assert len(lines) == 2
+    assert (lines.n_points, lines.n_segments) == (5, 3)
+    np.testing.assert_equal(lines.offsets, [0, 2, 5])
+    for line, eline in zip(lines, [l1, l2]):
+        np.testing.assert_equal(line, eline)
+    np.testing.assert_equal(lines[-1], l2)
+    np.testing.assert_equal(
+        lines.segments(),
+        [[(0, 1), (1, 1)], [(1, 1), (1, 0)], [(1, 0), (2, 1)]],
+    )
+
+    # Slices are views on points
+    sub = lines[1:]
+    assert len(sub) == 1
+    assert np.shares_memory(sub.points, lines.points)
+    np.testing.assert_equal(sub[0], l2)
+
+    # Concatenation
+    both = lines + sub
+    assert len(both) == 3
+    np.testing.assert_equal(both.offsets, [0, 2, 5, 8])
+    np.testing.assert_equal(both[2], l2)
+    assert len(lib.LineSet() + lib.LineSet()) == 0
+
+
+def test_compress():
+
+    l1 = np.array([[0, 1], [1, 1]])
+    l2 = np.array([[1, 1], [1, 0], [2, 1]])
+    l3 = np.array([[5, 5], [6, 6]])
+
+    lines = lib.compress([l1, l3, l2, l1, l2])
+    assert len(lines) == 4
+    np.testing.assert_equal(lines.offsets, [0, 2, 4, 7, 11])
+    np.testing.assert_equal(lines[3], [[0, 1], [1, 1], [1, 0], [2, 1]])
+
+    # Join lines even if not consecutive
+    lines = lib.compress([l2, l3, l1], reorder=True)
+    assert len(lines) == 2
+    np.testing.assert_equal(lines[0], l3)
+    np.testing.assert_equal(lines[1], [[0, 1], [1, 1], [1, 0], [2, 1]])
+
+    # Join lines whose ends are within tolerance
+    l1_close = l1 + 1e-4
+    assert len(lib.compress([l1_close, l2])) == 2
+    lines = lib.compress([l1_close, l2], tolerance=1e-3)
+    assert len(lines) == 1
+    assert lines.n_points == 4
+    np.testing.assert_equal(lines[0][-2:], l2[1:])
+    lines = lib.compress([l2, l3, l1_close], reorder=True, tolerance=1e-3)
+    assert len(lines) == 2
+
+    # Reorder joins the same ends as consecutive lines (even when they are
+    # hashed in neighbour cells of tolerance grid)
+    l1_shifted = l1 + [1.4e-3, 0]
+    l2_shifted = l2 + [1.6e-3, 0]
+    assert len(lib.compress([l1_shifted, l2_shifted], tolerance=1e-3)) == 1
+    lines = lib.compress([l2_shifted, l3, l1_shifted], reorder=True,
+                         tolerance=1e-3)
+    assert len(lines) == 2
+    assert lines.n_points == 6
+    assert len(lib.compress([l2_shifted, l3, l1_shifted], reorder=True,
+                            tolerance=1e-4)) == 3
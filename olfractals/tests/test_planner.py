@@ -0,0 +1,104 @@
+import numpy as np
+
+from olfractals.fractal import Fractal
+from olfractals.planner import CostModel, execute, make_plan
+from olfractals.raster import Raster
+
+
+def test_CostModel():
+    from olfractals.collection import BasisOperation, StartSegment
+
+    model = CostModel.calibrate(segments=1e3)
+    costs = model.to_dict()
+    assert all(cost > 0 for cost in costs.values())
+
+    fractal = Fractal(BasisOperation.dragon, as_basis=True)
+    segments = StartSegment.triangle
+    time_5, bytes_5 = model.estimate('memory', fractal, segments, 5)
+    time_6, bytes_6 = model.estimate('memory', fractal, segments, 6)
+    assert time_6 > time_5 and bytes_6 > bytes_5
+    assert model.estimate('stream', fractal, segments, 30)[1] < bytes_6 * 1e4
+    time_p, bytes_p = model.estimate(
+        'parallel', fractal, segments, 6, workers=4
+    )
+    assert time_p < time_6 and bytes_p > bytes_6
+
+
+def test_make_plan():
+    from olfractals.collection import BasisOperation, StartSegment
+
+    model = CostModel(compute=1e-6, stream=2e-6, draw=1e-6, chaos=1e-6)
+    fractal = Fractal(BasisOperation.dragon, as_basis=True, engine='affine')
+    segments = StartSegment.horizontal
+
+    plan = make_plan(fractal, segments, max_time=1, model=model, workers=1)
+    assert plan['strategy'] == 'memory'
+    assert plan['time'] <= 1
+    assert 2 ** (plan['n'] + 1) * 2e-6 > 1        # next one is too long
+    assert make_plan(
+        fractal, segments, max_time=10, model=model, workers=1
+    )['n'] > plan['n']
+
+    # Parallel computation goes deeper when available
+    plan_p = make_plan(fractal, segments, max_time=1, model=model, workers=8)
+    assert plan_p['strategy'] == 'parallel'
+    assert plan_p['workers'] == 8 and plan_p['n'] >= plan['n']
+
+    # Streaming keeps memory bounded
+    plan_s = make_plan(fractal, segments, max_time=10, max_bytes=2e7,
+                       model=model, workers=1)
+    assert plan_s['strategy'] == 'stream'
+    assert plan_s['bytes'] <= 2e7
+
+    # Depth is not exceeded, or reached with chaos game
+    assert make_plan(fractal, segments, depth=3, model=model)['n'] == 3
+    plan_c = make_plan(fractal, segments, max_time=0.1, depth=40, model=model)
+    assert plan_c['strategy'] == 'chaos'
+    assert plan_c['points'] == 1e5
+
+
+def test_execute():
+    from olfractals.collection import BasisOperation, StartSegment
+
+    fractal = Fractal(BasisOperation.leaf, as_basis=True)
+    segments = StartSegment.triangle
+    images = []
+    for strategy in ['memory', 'stream', 'chaos']:
+        plan = {'strategy': strategy, 'n': 4, 'points': 1e4, 'workers': None}
+        raster = execute(plan, fractal, segments, Raster(size=(50, 50)))
+        images.append(np.any(raster.image != 255, axis=2))
+        assert images[-1].any()
+    # Same fit for exact strategies
+    np.testing.assert_equal(images[0], images[1])
+
+
+def test_default_model(monkeypatch):
+    from olfractals import planner
+    from olfractals.collection import BasisOperation, StartSegment
+
+    # Calibrated once by process
+    calls = []
+    calibrate = CostModel.calibrate
+
+    def counted_calibrate(*args, **kwargs):
+        calls.append(args)
+        return calibrate(*args, **kwargs)
+
+    monkeypatch.setattr(CostModel, 'calibrate', counted_calibrate)
+    monkeypatch.setattr(planner, '_MODEL', {})
+    model = planner.default_model()
+    assert isinstance(model, CostModel)
+    assert all(cost > 0 for cost in model.to_dict().values())
+    assert planner.default_model() is model
+    assert len(calls) == 1
+
+    # Plans use calibrated model by default, picking strategy by workload
+    fractal = Fractal(BasisOperation.dragon, as_basis=True, engine='affine')
+    segments = StartSegment.triangle
+    small = make_plan(fractal, segments, max_time=0.1, depth=4, workers=1)
+    assert small == make_plan(fractal, segments, max_time=0.1, depth=4,
+                              model=model, workers=1)
+    large = make_plan(fractal, segments, max_time=0.1, depth=40, workers=1)
+    assert small['strategy'] in ('memory', 'stream') and small['n'] == 4
+    assert large['strategy'] == 'chaos'
+    assert len(calls) == 1
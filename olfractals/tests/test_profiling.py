@@ -0,0 +1,54 @@
+from olfractals import profiling
+from olfractals.fractal import Fractal
+from olfractals.raster import Raster
+
+
+def test_profile():
+    from olfractals.collection import BasisOperation, StartSegment
+
+    fractal = Fractal(BasisOperation.dragon, as_basis=True)
+    fractal.build_cache(2)
+    assert 'profile' not in fractal.growth_info
+
+    records = []
+    with profiling.profile(
+        callback=lambda stage, measures: records.append(stage)
+    ) as profiler:
+        assert profiling.is_active()
+        lines = fractal.compute_on(StartSegment.horizontal, 4)
+        Raster(size=(50, 50)).draw_lines(lines)
+    assert not profiling.is_active()
+    assert profiling.start() is None
+
+    summary = profiler.summary()
+    stages = summary['stages']
+    assert {'build_cache', 'compress', 'compute_on', 'draw'} <= set(stages)
+    assert stages['build_cache']['calls'] == 2          # iterations 3 and 4
+    assert stages['compute_on']['segments'] == lines.n_segments
+    assert stages['draw']['segments'] == lines.n_segments
+    assert stages['draw']['bytes'] > 0
+    assert len(records) == sum(m['calls'] for m in stages.values())
+
+    # Stages run while building an iteration are recorded on its level
+    assert sorted(summary['levels']) == [3, 4]
+    assert summary['levels'][4]['build_cache']['segments'] == 2 ** 4
+    assert 'compress' in summary['levels'][4]
+    assert sorted(fractal.growth_info['profile']) == [3, 4]
+    assert fractal.growth_info['profile'][4]['segments'] == 2 ** 4
+
+
+def test_instrumented():
+    @profiling.instrumented('double', lambda result: (len(result), 8))
+    def double(values):
+        return values * 2
+
+    assert double([1]) == [1, 1]
+    with profiling.profile() as profiler:
+        double([1])
+        with profiling.at_level(5):
+            double([1, 2])
+    assert profiler.stages['double'] == {
+        'calls': 2, 'time': profiler.stages['double']['time'],
+        'segments': 6, 'bytes': 16,
+    }
+    assert profiler.levels[5]['double']['segments'] == 4
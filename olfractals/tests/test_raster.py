@@ -0,0 +1,40 @@
+import numpy as np
+
+from olfractals.raster import Raster, clip_segments, read_png, segment_pixels
+
+
+def test_segment_pixels():
+    x, y = segment_pixels(np.array([[(0, 0), (3, 1)], [(2, 2), (2, 0)]]))
+    np.testing.assert_equal(x, [0, 1, 2, 3, 2, 2, 2])
+    np.testing.assert_equal(y, [0, 0, 1, 1, 2, 1, 0])
+
+    segments = clip_segments(
+        np.array([[(-1, 1), (3, 1)], [(5, 5), (6, 6)], [(1, -1), (1, 1)]]),
+        2, 2,
+    )
+    np.testing.assert_almost_equal(
+        segments, [[(0, 1), (2, 1)], [(1, 0), (1, 1)]]
+    )
+
+
+def test_Raster(tmp_path):
+
+    raster = Raster(size=(10, 10), line_params={'width': 1})
+    line = np.array([[0, 1], [1, 1], [1, 0], [2, 1]])
+
+    # Same fitting as Screen
+    params = raster.compute_fit_params(line)
+    assert params['factor'] == 4.0
+    raster.draw_line(line)
+
+    black = np.all(raster.image == 0, axis=2)
+    assert black.sum() == 13
+    assert black[7, 1:6].all()      # from (0, 1) to (1, 1)
+    assert black[3:8, 5].all()      # from (1, 1) to (1, 0)
+
+    # Png file
+    path = str(tmp_path / "image.png")
+    raster.save(path)
+    with open(path, 'rb') as file:
+        assert file.read(8) == b'\x89PNG\r\n\x1a\n'
+    np.testing.assert_equal(read_png(path), raster.image)
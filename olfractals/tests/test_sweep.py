@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from olfractals.fractal import Fractal, SafetyError
+from olfractals.raster import Raster
+from olfractals.sweep import Sweep, contact_sheet, param_grid
+
+
+def test_param_grid():
+    assert param_grid(a=[1, 2], b=[3]) == [{'a': 1, 'b': 3}, {'a': 2, 'b': 3}]
+
+
+def test_Sweep():
+    from olfractals.collection import BasisOperation, StartSegment
+
+    grid = param_grid(elbow_x=[0.4, 0.5, 0.6], elbow_y=[0.3, 0.5])
+    sweep = Sweep(BasisOperation.dragon, grid)
+    variants = sweep.compute_on(StartSegment.triangle, 6)
+    assert len(variants) == len(grid)
+    for params, lines in zip(grid, variants):
+        fractal = Fractal(
+            BasisOperation.configured(BasisOperation.dragon, **params),
+            as_basis=True, engine='affine',
+        )
+        expected = fractal.compute_on(StartSegment.triangle, 6)
+        np.testing.assert_equal(lines.offsets, expected.offsets)
+        np.testing.assert_equal(lines.points, expected.points)
+
+    # Variants with different topologies
+    def operation(n_points):
+        line = np.stack((np.linspace(0, 1, n_points),
+                         np.linspace(0, 0.2, n_points)), axis=1)
+        return [line], [np.array([[0, 0], [0, 0.5]])]
+
+    sweep = Sweep(operation, param_grid(n_points=[2, 3, 2]))
+    assert [len(fractal.matrices) for fractal in sweep.fractals] == [1, 2, 1]
+    variants = sweep.compute_on(StartSegment.horizontal, 3)
+    for params, lines in zip(sweep.grid, variants):
+        expected = Fractal(
+            lambda: operation(**params), as_basis=True, engine='affine'
+        ).compute_on(StartSegment.horizontal, 3)
+        np.testing.assert_equal(lines.segments(), expected.segments())
+
+    with pytest.raises(SafetyError):
+        sweep.compute_on(StartSegment.horizontal, 3, max_segments=10)
+
+
+def test_contact_sheet():
+    from olfractals.collection import BasisOperation, StartSegment
+
+    sweep = Sweep(BasisOperation.dragon, param_grid(
+        elbow_x=[0.4, 0.6], elbow_y=[0.3, 0.5],
+    ))
+    variants = sweep.compute_on(StartSegment.horizontal, 8)
+    raster = contact_sheet(variants, Raster(size=(100, 60)))
+    drawn = np.any(raster.image != 255, axis=2)
+    for rows in (slice(0, 30), slice(30, 60)):
+        for columns in (slice(0, 50), slice(50, 100)):
+            cell = drawn[rows, columns]
+            assert cell.any()
+            assert not cell[[0, -1]].any() and not cell[:, [0, -1]].any()
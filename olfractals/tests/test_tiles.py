@@ -0,0 +1,37 @@
+import numpy as np
+
+from olfractals.fractal import Fractal
+from olfractals.raster import Raster, read_png
+from olfractals.tiles import Poster, bucket_segments
+
+
+def test_bucket_segments():
+    segments = np.array([
+        [(1, 0), (2, 5)], [(5, 0), (25, 1)], [(-10, 0), (-5, 0)],
+        [(29, 3), (31, 3)],
+    ], dtype=float)
+    buckets = bucket_segments(segments, 10, 3)
+    assert [len(bucket) for bucket in buckets] == [2, 1, 2]
+    np.testing.assert_equal(buckets[0], segments[:2])
+    np.testing.assert_equal(buckets[2], segments[[1, 3]])
+    buckets = bucket_segments(segments, 10, 3, margin=5)
+    assert [len(bucket) for bucket in buckets] == [3, 1, 2]
+
+
+def test_Poster(tmp_path):
+    from olfractals.collection import BasisOperation, StartSegment
+
+    fractal = Fractal(BasisOperation.leaf, as_basis=True)
+    segments, n, size = StartSegment.triangle, 5, (100, 70)
+    for width in (1, 3):
+        line_params = {'width': width}
+        poster = Poster(size=size, tile_size=16, line_params=line_params,
+                        flip_y=True)
+        path = str(tmp_path / f"poster_{width}.png")
+        poster.render_fractal(fractal, segments, n, path, workers=4)
+        assert len(poster.strips()) == 5 and poster.n_tiles == 7
+
+        raster = Raster(size=size, line_params=line_params, flip_y=True)
+        raster.compute_fit_params(bounds=fractal.bounds(n, segments))
+        raster.draw_lines(fractal.compute_on(segments, n))
+        np.testing.assert_equal(read_png(path), raster.image)
@@ -35,3 +35,45 @@ def test_all():
     np.testing.assert_almost_equal(params['origin'], origin)
     a, f, v = params['angle'], params['factor'], params['vector']
     np.testing.assert_almost_equal((a, f, *v), (angle, factor, *vector))
+
+    # Test affine matrix
+    matrix = lib.get_matrix(points[:2], tpoints[:2])
+    np.testing.assert_almost_equal(
+        lib.affine_transform(points, [matrix], decimals=None)[0], tpoints
+    )
+
+    # Test composition
+    matrix2 = lib.compose(matrix, matrix)
+    np.testing.assert_almost_equal(
+        lib.affine_transform(points, [matrix2], decimals=None)[0],
+        lib.affine_transform(tpoints, [matrix], decimals=None)[0],
+    )
+
+    # Test batched params and transformations
+    segments = [points[:2], tpoints[:2], points[2:], tpoints[1:3]]
+    b_params = lib.get_batch_params(points[:2], segments)
+    for k, segment in enumerate(segments):
+        params = lib.get_params(points[:2], segment)
+        np.testing.assert_almost_equal(b_params['angle'][k], params['angle'])
+        np.testing.assert_almost_equal(
+            b_params['factor'][k], params['factor']
+        )
+        np.testing.assert_almost_equal(
+            b_params['vector'][k], params['vector']
+        )
+        np.testing.assert_almost_equal(
+            lib.get_matrices(points[:2], segments)[k],
+            lib.get_matrix(points[:2], segment),
+        )
+    out = np.empty((len(segments), len(points), 2))
+    result = lib.batch_transform(points, **b_params, out=out)
+    assert result is out
+    for k, segment in enumerate(segments):
+        params = lib.get_params(points[:2], segment)
+        np.testing.assert_almost_equal(
+            out[k], lib.transform(points, **params)
+        )
+    np.testing.assert_almost_equal(
+        lib.batch_transform(points, vector=[vector])[0],
+        np.add(points, vector),
+    )
@@ -0,0 +1,180 @@
+"""Tiled rendering of posters too big to be held as a single image
+
+The poster is rendered strip by strip (a row of tiles), each strip being
+written in a png file as soon as it is drawn, so memory is bounded by a
+strip whatever the poster size:
+- lines of a strip are computed only for subtrees intersecting the strip
+    (see Fractal.iter_lines region)
+- segments of each chunk of lines are routed to the tiles they overlap
+    with a bucket index (segments sorted by tile)
+- tiles are rasterized in parallel threads (NumPy kernels release the GIL)
+
+Segments are clipped to the poster only, not to tiles, so that pixels are
+the same as if the poster was drawn at once on a Raster.
+
+    >>> poster = Poster(size=(20000, 20000), flip_y=True)
+    >>> poster.render_fractal(fractal, StartSegment.triangle, 18, "poster.png")
+"""
+import numpy as np
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .canvas import Canvas
+from .lines import LineSet
+from .raster import PNGWriter, clip_image_segments, rasterize
+
+TILE_SIZE = 1024
+
+
+def bucket_segments(segments, tile_width, n_tiles, margin=0):
+    """Route segments to the tiles of a row they overlap
+
+    Args:
+        segments (array): 3d-array (n*2*2) of segments (in pixels of row)
+        tile_width (int): width of tiles in pixels
+        n_tiles (int): number of tiles of row
+        margin (float): distance (in pixels) from tile where segments are
+            still routed to it
+
+    Return:
+        (list): 3d-array of segments of each tile
+    """
+    x = segments[:, :, 0]
+    first = np.floor((x.min(axis=1) - margin) / tile_width).astype(np.int64)
+    last = np.floor((x.max(axis=1) + margin) / tile_width).astype(np.int64)
+    first, last = np.maximum(first, 0), np.minimum(last, n_tiles - 1)
+    counts = np.maximum(last - first + 1, 0)
+
+    # One entry by (segment, tile) pair, sorted by tile
+    index = np.repeat(np.arange(len(segments)), counts)
+    shifts = np.arange(counts.sum()) - np.repeat(
+        np.cumsum(counts) - counts, counts
+    )
+    tiles = np.repeat(first, counts) + shifts
+    order = np.argsort(tiles, kind='stable')
+    bounds = np.searchsorted(tiles[order], np.arange(n_tiles + 1))
+    return [
+        segments[index[order[start:stop]]]
+        for start, stop in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+class Poster(Canvas):
+
+    def __init__(self, size=(20000, 20000), tile_size=TILE_SIZE,
+                 line_params=None, flip_y=False):
+        """Initiate a Poster object
+
+        Args:
+            size (2-int-tuple): width and height of poster in pixels
+            tile_size (int): width and height of tiles in pixels
+            line_params (dict): default line drawing parameters
+            flip_y (bool): make y axis go up when fitting points
+        """
+        super().__init__(size=size, line_params=line_params, flip_y=flip_y)
+        self.tile_size = tile_size
+
+    @property
+    def n_tiles(self):
+        """Number of tiles by row"""
+        return -(-self.size[0] // self.tile_size)
+
+    def strips(self):
+        """Return list of (first row, last row + 1) of strips"""
+        starts = range(0, self.size[1], self.tile_size)
+        return [
+            (start, min(start + self.tile_size, self.size[1]))
+            for start in starts
+        ]
+
+    def region(self, start, stop, margin=0):
+        """Return rectangle (x_min, x_max, y_min, y_max) of points fitted in
+        rows start to stop (plus margin pixels), None if not fitted"""
+        if self.fit_params is None:
+            return None
+        pixels = np.array([
+            (-margin, start - margin), (self.size[0] + margin, stop + margin)
+        ], dtype=float)
+        factor = self.fit_params['factor']
+        origin = self.fit_params['origin']
+        scale = np.array([factor, -factor if self.flip_y else factor])
+        offset = origin + self.fit_params['vector'] - scale * origin
+        (x1, y1), (x2, y2) = (pixels - offset) / scale
+        return min(x1, x2), max(x1, x2), min(y1, y2), max(y1, y2)
+
+    def _draw_strip(self, strip, start, chunks, color, width, executor):
+        """Draw chunks of lines on strip image of rows from start"""
+        margin = width
+        tiles = [
+            strip[:, x:x + self.tile_size]
+            for x in range(0, self.size[0], self.tile_size)
+        ]
+        for lines in chunks:
+            segments = LineSet.from_lines(lines).segments()
+            points = segments.reshape(-1, 2)
+            self.fit_transform(points, out=points)
+            segments = clip_image_segments(segments, self.size, width)
+            segments[:, :, 1] -= start
+            y = segments[:, :, 1]
+            inside = (
+                (y.max(axis=1) >= -margin)
+                & (y.min(axis=1) <= len(strip) + margin)
+            )
+            buckets = bucket_segments(
+                segments[inside], self.tile_size, self.n_tiles, margin
+            )
+            jobs = [
+                (tile, tile_segments - [i * self.tile_size, 0])
+                for i, (tile, tile_segments) in enumerate(zip(tiles, buckets))
+                if len(tile_segments)
+            ]
+            list(executor.map(
+                lambda job: rasterize(*job, color, width, clip=False), jobs
+            ))
+
+    def render(self, chunks, path, workers=None, color=None, width=None):
+        """Render poster as png file strip by strip
+
+        Args:
+            chunks (callable): return chunks of lines (iterable of LineSet)
+                that might intersect region (4-float-tuple or None), lines
+                out of region are clipped anyway
+            path (str): path of png file
+            workers (int): number of threads rasterizing tiles
+                default is number of CPUs
+            color (tuple): color of lines, default is line_params one
+            width (int): width of lines, default is line_params one
+        """
+        color = self.line_params['color'] if color is None else color
+        width = self.line_params['width'] if width is None else width
+        workers = workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as executor, \
+                PNGWriter(path, self.size) as writer:
+            for start, stop in self.strips():
+                strip = np.empty((stop - start, self.size[0], 3),
+                                 dtype=np.uint8)
+                strip[:] = self.background
+                self._draw_strip(
+                    strip, start, chunks(self.region(start, stop, width)),
+                    color, width, executor,
+                )
+                writer.write(strip)
+
+    def render_fractal(self, fractal, segments, n, path, fit=True, **params):
+        """Render n iterations of fractal on segments as png file, each
+        strip only expanding subtrees intersecting it
+
+        Args:
+            fractal (Fractal): fractal to render
+            segments (list): list of segments (2-float-tuple)
+            n (int): number of iterations
+            path (str): path of png file
+            fit (bool): fit poster on fractal bounds
+            params: render params (workers, color, width)
+        """
+        if fit:
+            self.compute_fit_params(bounds=fractal.bounds(n, segments))
+        self.render(
+            lambda region: fractal.iter_lines(segments, n, region=region),
+            path, **params
+        )
@@ -3,17 +3,29 @@
 A segment is defined as 2 points (tuples)
 We consider segments as oriented, so the order of these points matter
 """
+import math
 import numpy as np
 
+from . import profiling
+from .profiling import instrumented, measure_points
+
 ORIGIN = np.array([0, 0])
 
 
 def get_angle(v1, v2, as_radian=False):
     """Return angle b/w 2 angles"""
-    angle = np.math.atan2(np.linalg.det([v1, v2]), np.dot(v1, v2))
+    angle = math.atan2(np.linalg.det([v1, v2]), np.dot(v1, v2))
     return angle if as_radian else np.degrees(angle)
 
 
+def get_angles(v1, vectors, as_radian=False):
+    """Return angles b/w vector v1 and each vector of 2d-matrix (k*2)"""
+    vectors = to_array(vectors)
+    pairs = np.stack((np.broadcast_to(v1, vectors.shape), vectors), axis=1)
+    angles = np.arctan2(np.linalg.det(pairs), vectors @ v1)
+    return angles if as_radian else np.degrees(angles)
+
+
 def get_length(vector):
     """Return length of vector"""
     return np.linalg.norm(vector)
@@ -28,6 +40,7 @@ def to_array(arr):
 # ---- Transformations
 
 
+@instrumented('get_params')
 def get_params(seg1, seg2, as_radian=False):
     """Return parameters to transform seg1 into seg2"""
     seg1, seg2 = to_array(seg1), to_array(seg2)
@@ -44,12 +57,73 @@ def get_params(seg1, seg2, as_radian=False):
     }
 
 
+@instrumented('get_params')
+def get_batch_params(seg1, segments, as_radian=False):
+    """Return parameters to transform seg1 into each of the k segments
+
+    Same as get_params but angle, factor and vector are arrays (k, k and
+    k*2) computed at once
+    """
+    seg1 = to_array(seg1).astype(float)
+    segments = to_array(segments).astype(float).reshape(-1, 2, 2)
+    v1 = seg1[1] - seg1[0]
+    vectors = segments[:, 1] - segments[:, 0]
+    return {
+        'angle': get_angles(v1, vectors, as_radian=as_radian),
+        'factor': np.hypot(vectors[:, 0], vectors[:, 1]) / get_length(v1),
+        'vector': segments[:, 0] - seg1[0],
+        'as_radian': as_radian,
+        'origin': seg1[0],
+    }
+
+
 def rot_matrix(angle, as_radian=False):
-    """Return 2d rotation matrix"""
+    """Return 2d rotation matrix (2*2), or stack of them (k*2*2) if angle
+    is an array"""
     if not as_radian:
         angle = np.radians(angle)
     cos, sin = np.cos(angle), np.sin(angle)
-    return np.array([[cos, -sin], [sin, cos]])
+    return np.moveaxis(np.array([[cos, -sin], [sin, cos]]), (0, 1), (-2, -1))
+
+
+def params2matrix(angle=0, factor=1, vector=(0, 0), origin=ORIGIN,
+                  as_radian=False):
+    """Return affine matrix (2*3) of a full transformation (see transform)
+
+    angle and factor can be arrays (k) and vector a 2d-matrix (k*2) to get
+    a stack of matrices (k*2*3)
+    """
+    factor = np.asarray(factor, dtype=float)[..., np.newaxis, np.newaxis]
+    linear = factor * rot_matrix(angle, as_radian=as_radian)
+    origin = to_array(origin)
+    translation = origin + to_array(vector) - linear @ origin
+    return np.concatenate((linear, translation[..., np.newaxis]), axis=-1)
+
+
+def get_matrix(seg1, seg2):
+    """Return 2d affine matrix (2*3) to transform seg1 into seg2"""
+    return get_matrices(seg1, [seg2])[0]
+
+
+def get_matrices(seg1, segments):
+    """Return 3d-array (k*2*3) of affine matrices to transform seg1 into
+    each of the k segments"""
+    params = get_batch_params(seg1, segments, as_radian=True)
+    return params2matrix(**params)
+
+
+def compose(matrix1, matrix2):
+    """Return affine matrix applying matrix2 then matrix1
+
+    Both arguments can be stacks of matrices (k*2*3) and are broadcast
+    """
+    matrix1, matrix2 = to_array(matrix1), to_array(matrix2)
+    linear1 = matrix1[..., :2]
+    return np.concatenate((
+        np.matmul(linear1, matrix2[..., :2]),
+        np.matmul(linear1, matrix2[..., 2:]) + matrix1[..., 2:],
+    ), axis=-1)
+
 
 def rotate(points, angle, origin=ORIGIN, as_radian=False):
     """Rotate points by angle relative to origin
@@ -76,6 +150,7 @@ def scale(points, factor, origin=ORIGIN):
     return factor * (points - translation) + translation
 
 
+@instrumented('transform', measure_points)
 def transform(points, angle=None, factor=None, vector=None, origin=ORIGIN,
               as_radian=False, decimals=3):
     """Full transformation on points (rotation, homothety and translation)
@@ -101,5 +176,59 @@ def transform(points, angle=None, factor=None, vector=None, origin=ORIGIN,
         vector = to_array(vector)
         points += vector
     if decimals and len(points):
+        start = profiling.start()
         points = np.round(points, decimals)
+        profiling.stop('round', start, *measure_points(points))
     return points
+
+
+@instrumented('affine_transform', measure_points)
+def affine_transform(points, matrices, decimals=3, out=None):
+    """Apply each affine matrix on points in a single batched operation
+
+    Args:
+        points (matrix) : 2d-matrix (n*2) of points
+        matrices (array): 3d-array (k*2*3) of affine matrices
+        decimals (int)  : round transformed points
+        out (array)     : 3d-array (k*n*2) where to write transformed points
+            instead of allocating a new one
+
+    Return:
+        (array): 3d-array (k*n*2) of transformed points
+    """
+    points = to_array(points)
+    # Compute in points precision (float32 points stay float32)
+    dtype = np.result_type(points.dtype, np.float32)
+    matrices = to_array(matrices).astype(dtype, copy=False)
+    result = np.einsum('kij,nj->kni', matrices[:, :, :2], points, out=out)
+    result += matrices[:, np.newaxis, :, 2]
+    if decimals and result.size:
+        start = profiling.start()
+        np.round(result, decimals, out=result)
+        profiling.stop('round', start, *measure_points(result))
+    return result
+
+
+def batch_transform(points, angle=None, factor=None, vector=None,
+                    origin=ORIGIN, as_radian=False, decimals=3, out=None):
+    """Apply k full transformations on points in a single batched operation
+
+    Same parameters as transform except angle, factor (k) and vector (k*2)
+    are arrays of parameters (as returned by get_batch_params)
+
+    Return:
+        (array): 3d-array (k*n*2) of transformed points
+    """
+    assert not (factor is None and vector is None and angle is None), (
+        "Expecting at least one transformation"
+    )
+    sizes = [
+        len(param) for param in (angle, factor, vector) if param is not None
+    ]
+    matrices = params2matrix(
+        angle=np.zeros(sizes[0]) if angle is None else angle,
+        factor=1 if factor is None else factor,
+        vector=(0, 0) if vector is None else vector,
+        origin=origin, as_radian=as_radian,
+    )
+    return affine_transform(points, matrices, decimals=decimals, out=out)